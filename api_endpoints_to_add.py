@@ -19,7 +19,8 @@ def get_all_users():
     
     try:
         users = data_store.profile_manager.get_all_users()
-        return [UserSummary(**user) for user in users]
+        # Summaries come straight from UserProfileManager; skip per-user validation
+        return [UserSummary.model_construct(**user) for user in users]
     except Exception as e:
         logger.error(f"Error getting users: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -18,6 +18,9 @@ MODEL_DIR.mkdir(exist_ok=True)
 
 # --- File Paths (Convert to strings for backward compatibility) ---
 RAW_DATA_FILE = str(DATA_DIR / 'raw_behavior_logs.csv')
+# Raw logs are written as Parquet next to RAW_DATA_FILE when pyarrow is installed;
+# set to 'csv' to keep the plain CSV output
+RAW_DATA_FORMAT = 'parquet'
 PROCESSED_DATA_FILE = str(DATA_DIR / 'processed_features.csv')
 MODEL_FILE = str(MODEL_DIR / 'isolation_forest_model.pkl')
 
@@ -3,16 +3,35 @@ import numpy as np
 import os
 import sys
 import json
-import traceback
+import time
+import asyncio
+import hashlib
+import functools
+import uuid
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from pathlib import Path
+from collections import OrderedDict
 from typing import List, Optional, Dict, Any
-from fastapi import FastAPI, HTTPException, BackgroundTasks, status
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 import joblib
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow  # noqa: F401  (Parquet engine for the processed-data cache)
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
 # --- PATH CORRECTION ---
 try:
     current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -31,11 +50,9 @@ try:
 except ImportError:
     from config import PROCESSED_DATA_FILE, MODEL_FILE, RAW_DATA_FILE
     
-# Import core components
-from src.xai_explainer import xai_pipeline, load_data_and_model
-from src.data_generator import generate_synthetic_logs
-from src.feature_engineer import feature_engineering_pipeline
-from src.model_train import model_training_pipeline, MODEL_FEATURES
+# Core components (xai_explainer, data_generator, feature_engineer, model_train)
+# pull in shap/sklearn/scipy, so they are imported inside the endpoints that use
+# them. Startup, /health and the listing endpoints never load them.
 
 # Import logging
 try:
@@ -50,12 +67,21 @@ except ImportError:
 # FASTAPI APP INITIALIZATION
 # =============================================================================
 
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (C serializer, numpy-aware)."""
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+# Fall back to the stdlib-based JSONResponse when orjson is not installed
+DefaultResponse = ORJSONResponse if orjson is not None else JSONResponse
+
 app = FastAPI(
     title="VORTEX X-ADS API",
     description="Explainable Anomaly Detection System for Insider Threat Detection",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=DefaultResponse
 )
 
 # --- CORS Configuration ---
@@ -117,6 +143,7 @@ class PipelineStatus(BaseModel):
     status: str
     message: str
     timestamp: str
+    task_id: Optional[str] = None
 
 class ModelMetrics(BaseModel):
     """Model performance metrics."""
@@ -153,33 +180,118 @@ class BatchPredictionResponse(BaseModel):
 # GLOBAL DATA STORE
 # =============================================================================
 
+class DataSnapshot:
+    """
+    One load of the data and model together with every index derived from it.
+    Built completely before it is published, so a request that works from one
+    snapshot never applies row positions from one load to the frame of another.
+    """
+    def __init__(self, df: Optional[pd.DataFrame] = None, model=None,
+                 metrics: Optional[Dict] = None,
+                 precomputed_shap: Optional[Dict[str, Any]] = None, identity: str = ""):
+        self.df = df
+        self.model = model
+        self.metrics = metrics
+        # SHAP values precomputed by model training (see load_precomputed_shap)
+        self.precomputed_shap = precomputed_shap
+        # Fingerprint of the files this load read; keys HTTP cache validators
+        self.identity = identity
+        self.explainer = None
+        # event_id -> explanation for this model, least recently used first
+        self.explanations: "OrderedDict[str, Dict]" = OrderedDict()
+        self.last_loaded: Optional[datetime] = None
+        
+        # user_id -> row positions (most recent first), so per-user lookups skip
+        # both the full-column scan and a per-request sort
+        self.user_index: Dict[str, np.ndarray] = compute_user_recent_rows(df) if df is not None else {}
+        self.user_stats: Dict[str, Dict] = compute_user_stats(df) if df is not None else {}
+        self.event_index: Dict[str, int] = build_event_index(df) if df is not None else {}
+        self.risk_orders: Dict[Optional[str], np.ndarray] = compute_risk_orders(df) if df is not None else {}
+        self.prebuilt_pages: Dict[tuple, bytes] = (
+            prebuild_risk_pages(df, self.risk_orders) if df is not None else {}
+        )
+        # Event counts reported by /metrics when no metrics file exists
+        self.total_events: int = len(df) if df is not None else 0
+        self.total_anomalies: int = (
+            int(df['anomaly_flag_truth'].sum())
+            if df is not None and 'anomaly_flag_truth' in df.columns else 0
+        )
+    
+    def get_explainer(self):
+        """Return the SHAP explainer for this model, building it on first use."""
+        if self.explainer is None and self.model is not None:
+            from src.xai_explainer import create_explainer
+            self.explainer = create_explainer(self.model)
+        return self.explainer
+    
+    def is_loaded(self) -> bool:
+        """Check if data and model are loaded."""
+        return self.df is not None and self.model is not None
+
 class DataStore:
     """Global data store for caching loaded data and model."""
     def __init__(self):
-        self.df: Optional[pd.DataFrame] = None
-        self.model = None
-        self.last_loaded: Optional[datetime] = None
-        self.metrics: Optional[Dict] = None
+        # Replaced by a single assignment on every load; requests take one
+        # reference to it and read everything from that
+        self.snapshot = DataSnapshot()
+        # In-flight reload shared by concurrent callers (see reload)
+        self._reload_task: Optional[asyncio.Future] = None
+        # Reload requests made so far, and the newest one a finished load covers
+        self._reload_requests: int = 0
+        self._reloaded_through: int = 0
     
     def load(self):
         """Load or reload data and model."""
         try:
-            self.df = load_processed_data()
-            self.model = load_model()
-            self.last_loaded = datetime.now()
+            # The model and metrics files do not depend on the events, so read
+            # them in the background while the processed data is parsed and indexed
+            with ThreadPoolExecutor(max_workers=3, thread_name_prefix="datastore-load") as pool:
+                model_future = pool.submit(load_model)
+                metrics_future = pool.submit(load_model_metrics)
+                shap_future = pool.submit(load_precomputed_shap)
+                # Taken before reading, so a file replaced mid-load changes the
+                # identity of the next load rather than going unnoticed
+                identity = data_identity()
+                df = load_processed_data()
+                snapshot = DataSnapshot(
+                    df, model_future.result(), metrics_future.result(),
+                    shap_future.result(), identity=identity
+                )
+            snapshot.last_loaded = datetime.now()
+            # Nothing is visible to requests until this point; a failed load
+            # leaves the previous snapshot in place
+            self.snapshot = snapshot
             logger.info("Data and model loaded successfully")
         except Exception as e:
-            logger.error(f"Error loading data/model: {e}")
+            logger.error("Error loading data/model: %s", e)
             raise
     
     def is_loaded(self) -> bool:
         """Check if data and model are loaded."""
-        return self.df is not None and self.model is not None
+        return self.snapshot.is_loaded()
     
-    def reload(self):
-        """Force reload of data and model."""
-        logger.info("Reloading data and model...")
+    async def reload(self):
+        """
+        Force reload of data and model in a worker thread.
+        
+        Callers share a reload only if they asked for it before it started
+        reading files. Anyone arriving while a load is already running may have
+        just rewritten those files, so another load runs after it for them.
+        """
+        self._reload_requests += 1
+        wanted = self._reload_requests
+        while self._reloaded_through < wanted:
+            if self._reload_task is None or self._reload_task.done():
+                logger.info("Reloading data and model...")
+                self._reload_task = asyncio.ensure_future(asyncio.to_thread(self._load_requested))
+            # shield: a cancelled caller must not cancel the reload others are awaiting
+            await asyncio.shield(self._reload_task)
+    
+    def _load_requested(self):
+        """load(), covering every reload requested before it starts reading files."""
+        generation = self._reload_requests
         self.load()
+        self._reloaded_through = max(self._reloaded_through, generation)
 
 # Initialize global data store
 data_store = DataStore()
@@ -188,46 +300,298 @@ data_store = DataStore()
 # UTILITY FUNCTIONS
 # =============================================================================
 
+# Explicit dtypes for the processed CSV: 0/1 flags and small ints as int8, ids as
+# categories, so the parser never infers wide or object columns
+PROCESSED_CSV_DTYPES = {
+    'user_id': 'category',
+    'anomaly_flag_truth': 'int8',
+    'sensitive_file_access': 'int8',
+    'external_ip_connection': 'int8',
+    'hour_of_day': 'int8',
+    'day_of_week': 'int8',
+    'is_weekend': 'int8',
+    'is_off_hours': 'int8',
+}
+
+def raw_data_exists() -> bool:
+    """Whether generated raw logs exist, as CSV or as their Parquet copy."""
+    return os.path.exists(RAW_DATA_FILE) or Path(RAW_DATA_FILE).with_suffix('.parquet').exists()
+
+def processed_parquet_path() -> Path:
+    """Parquet cache that sits next to the processed CSV."""
+    return Path(PROCESSED_DATA_FILE).with_suffix('.parquet')
+
+def file_stamp(path) -> str:
+    """"<st_mtime_ns>:<st_size>" of path, or "-" if it cannot be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return "-"
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+# Parquet schema metadata key holding the file_stamp of the CSV the cache was built from
+PARQUET_SOURCE_KEY = b'vortex_source_csv'
+
+def migrate_processed_data_to_parquet(df: pd.DataFrame, source_stamp: str) -> Optional[Path]:
+    """Write the freshly parsed processed CSV as a typed Parquet cache, tagged with its source."""
+    if not PARQUET_AVAILABLE:
+        return None
+    
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    parquet_path = processed_parquet_path()
+    # Written beside the cache and swapped in, so a concurrent reader (another
+    # worker loading at the same time) never sees a partially written file
+    tmp_path = parquet_path.with_name(f"{parquet_path.name}.{os.getpid()}.tmp")
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            PARQUET_SOURCE_KEY: source_stamp.encode(),
+        })
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, parquet_path)
+        logger.info("Cached processed data as Parquet: %s", parquet_path)
+        return parquet_path
+    except Exception as e:
+        logger.warning("Could not write Parquet cache %s: %s", parquet_path, e)
+        return None
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+def read_processed_frame() -> pd.DataFrame:
+    """
+    Read the processed events, preferring the Parquet cache when pyarrow is
+    installed and the cache was built from the CSV as it is now (same mtime_ns
+    and size; an mtime comparison misses restores and same-tick rewrites).
+    """
+    csv_path = Path(PROCESSED_DATA_FILE)
+    parquet_path = processed_parquet_path()
+    # Taken before parsing, so a CSV rewritten mid-read is not cached as current
+    source_stamp = file_stamp(csv_path)
+    
+    if PARQUET_AVAILABLE and parquet_path.exists():
+        try:
+            import pyarrow.parquet as pq
+            cached_stamp = (pq.read_schema(parquet_path).metadata or {}).get(PARQUET_SOURCE_KEY)
+            if cached_stamp == source_stamp.encode():
+                return pd.read_parquet(parquet_path, engine='pyarrow')
+            logger.info("Parquet cache %s is not from the current CSV; rebuilding it", parquet_path)
+        except Exception as e:
+            # A damaged cache is rebuilt from the CSV below
+            logger.warning("Could not read Parquet cache %s, using the CSV: %s", parquet_path, e)
+    
+    # pyarrow's multithreaded CSV reader when available, else the C parser.
+    # Timestamps stay native datetime64 and are formatted only on serialization.
+    read_options = dict(engine='pyarrow' if PARQUET_AVAILABLE else 'c', parse_dates=['timestamp'])
+    try:
+        df = pd.read_csv(csv_path, dtype=PROCESSED_CSV_DTYPES, **read_options)
+    except ValueError as e:
+        # An empty cell cannot be parsed as int8; read the numbers as inferred
+        # (float where values are missing) and narrow only the complete columns
+        logger.warning("Processed data has missing values in integer columns (%s); reading them as float", e)
+        df = pd.read_csv(csv_path, dtype={'user_id': 'category'}, **read_options)
+        for column, dtype in PROCESSED_CSV_DTYPES.items():
+            if column in df.columns and dtype == 'int8' and not df[column].isna().any():
+                df[column] = df[column].astype('int8')
+    migrate_processed_data_to_parquet(df, source_stamp)
+    return df
+
+# Health probes arrive far more often than these files change, so each path is
+# stat'ed at most once per TTL
+FILE_CHECK_TTL_SECONDS = 5.0
+_file_exists_cache: Dict[str, tuple] = {}
+
+def file_exists_cached(path: str) -> bool:
+    """os.path.exists with a short TTL cache."""
+    now = time.monotonic()
+    cached = _file_exists_cache.get(path)
+    if cached is None or now - cached[0] > FILE_CHECK_TTL_SECONDS:
+        cached = (now, os.path.exists(path))
+        _file_exists_cache[path] = cached
+    return cached[1]
+
 def load_processed_data():
     """Load the processed dataset with anomaly scores."""
     if not os.path.exists(PROCESSED_DATA_FILE):
-        logger.warning(f"Processed data file not found: {PROCESSED_DATA_FILE}")
+        logger.warning("Processed data file not found: %s", PROCESSED_DATA_FILE)
         return None
     
-    df = pd.read_csv(PROCESSED_DATA_FILE)
-    
-    # Risk categorization
-    q_low = df['anomaly_score'].quantile(0.80)
-    q_high = df['anomaly_score'].quantile(0.95)
+    df = read_processed_frame()
     
-    def categorize_risk(score):
-        if score >= q_high:
-            return "High"
-        elif score >= q_low:
-            return "Medium"
-        else:
-            return "Low"
+    # Risk categorization: score >= q95 -> High, >= q80 -> Medium, else Low
+    scores = df['anomaly_score'].to_numpy(dtype=float)
+    thresholds = np.nanquantile(scores, [0.80, 0.95])
+    codes = np.searchsorted(thresholds, scores, side='right')
+    codes[np.isnan(scores)] = 0  # Unscored events stay Low
+    df['risk_level'] = pd.Categorical.from_codes(codes, categories=['Low', 'Medium', 'High'], ordered=True)
     
-    df['risk_level'] = df['anomaly_score'].apply(categorize_risk)
-    df['timestamp'] = pd.to_datetime(df['timestamp']).dt.strftime('%Y-%m-%d %H:%M:%S')
+    # Categorical ids turn per-user filters and groupbys into integer code comparisons
+    df['user_id'] = df['user_id'].astype('category')
     
-    logger.info(f"Loaded {len(df)} events from processed data")
+    logger.info("Loaded %s events from processed data", len(df))
     return df
 
+def compute_risk_orders(df: pd.DataFrame) -> Dict[Optional[str], np.ndarray]:
+    """
+    Row positions by descending anomaly_score for each /risks filter, so a
+    request only slices a precomputed array. Key None is the default view
+    (Medium and High).
+    """
+    order = np.argsort(-df['anomaly_score'].to_numpy(dtype=float), kind='stable')
+    # Ordered categorical codes: Low=0, Medium=1, High=2
+    ordered_codes = df['risk_level'].cat.codes.to_numpy()[order]
+    
+    risk_orders = {
+        level: order[ordered_codes == code]
+        for code, level in enumerate(df['risk_level'].cat.categories)
+    }
+    risk_orders[None] = order[ordered_codes >= df['risk_level'].cat.categories.get_loc('Medium')]
+    return risk_orders
+
+# (risk_level, limit, offset) of the /risks requests the frontend integration
+# docs make (top High alerts, latest alert); their JSON body is rendered once per load
+HOT_RISK_PAGES = [('High', 20, 0), ('High', 1, 0), (None, 1, 0)]
+
+def prebuild_risk_pages(df: pd.DataFrame, risk_orders: Dict[Optional[str], np.ndarray]) -> Dict[tuple, bytes]:
+    """Render the JSON bodies of the HOT_RISK_PAGES from the sorted row orders."""
+    pages = {}
+    for risk_level, limit, offset in HOT_RISK_PAGES:
+        order = risk_orders[risk_level][offset:offset + limit]
+        pages[(risk_level, limit, offset)] = DefaultResponse(content=events_to_records(df, order)).body
+    return pages
+
+def build_event_index(df: pd.DataFrame) -> Dict[str, int]:
+    """event_id -> row position; on duplicate ids the first row wins, like a mask lookup."""
+    event_ids = df['event_id'].tolist()
+    n = len(event_ids)
+    # Insert in reverse so earlier rows overwrite later duplicates
+    return dict(zip(reversed(event_ids), range(n - 1, -1, -1)))
+
+def compute_user_recent_rows(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Row positions of each user's events, most recent first (ties in row order, NaT last)."""
+    timestamps = df['timestamp'].to_numpy()
+    # NaT is INT64_MIN, which does not survive negation; sort it last explicitly
+    missing = np.isnat(timestamps)
+    newest_first = -np.where(missing, 0, timestamps.view('i8'))
+    by_time = np.lexsort((newest_first, missing))
+    codes = df['user_id'].cat.codes.to_numpy()[by_time]
+    # Stable regroup by user keeps the time order inside each user
+    grouped = by_time[np.argsort(codes, kind='stable')]
+    counts = np.bincount(codes, minlength=len(df['user_id'].cat.categories))
+    splits = np.split(grouped, np.cumsum(counts)[:-1])
+    return {
+        user_id: rows
+        for user_id, rows, count in zip(df['user_id'].cat.categories, splits, counts)
+        if count
+    }
+
+def compute_user_stats(df: pd.DataFrame) -> Dict[str, Dict]:
+    """Aggregate per-user event counts and score statistics in one pass."""
+    risk_counts = pd.crosstab(df['user_id'], df['risk_level']).reindex(
+        columns=['High', 'Medium', 'Low'], fill_value=0
+    )
+    scores = df.groupby('user_id', observed=True)['anomaly_score'].agg(['size', 'mean', 'max'])
+    
+    stats = pd.DataFrame({
+        'total_events': scores['size'],
+        'high_risk_events': risk_counts['High'],
+        'medium_risk_events': risk_counts['Medium'],
+        'low_risk_events': risk_counts['Low'],
+        'average_anomaly_score': scores['mean'].astype(float),
+        'max_anomaly_score': scores['max'].astype(float)
+    })
+    stats.index = stats.index.astype(str)
+    return stats.to_dict('index')
+
+RISK_EVENT_COLUMNS = ['event_id', 'user_id', 'timestamp', 'anomaly_score', 'risk_level', 'anomaly_flag_truth']
+
+def events_to_records(df: pd.DataFrame, rows: Optional[np.ndarray] = None) -> List[Dict]:
+    """
+    Convert event rows (all of df, or the given row positions) to RiskEvent dicts,
+    formatting timestamps for output. Missing values (NaN/NaT) become None.
+    """
+    # Gather just the response columns at the requested positions (no full-width
+    # row copy), then zip native Python lists; cheaper than to_dict('records')
+    columns = []
+    for col in RISK_EVENT_COLUMNS:
+        values = df[col] if rows is None else df[col].take(rows)
+        if col == 'timestamp':
+            values = values.dt.strftime('%Y-%m-%d %H:%M:%S')
+        if values.hasnans:
+            # null, as orjson writes NaN; the stdlib encoder (allow_nan=False)
+            # would otherwise fail partway through a streamed response
+            values = values.astype(object).where(values.notna(), None)
+        columns.append(values.tolist())
+    return [dict(zip(RISK_EVENT_COLUMNS, row)) for row in zip(*columns)]
+
+# Larger /risks results are streamed, serializing this many rows at a time
+RISK_STREAM_CHUNK = 1000
+
+def stream_event_records(df: pd.DataFrame, order: np.ndarray):
+    """Yield a JSON array of RiskEvent rows, building one chunk of dicts at a time."""
+    yield b'['
+    for start in range(0, len(order), RISK_STREAM_CHUNK):
+        records = events_to_records(df, order[start:start + RISK_STREAM_CHUNK])
+        if orjson is not None:
+            body = orjson.dumps(records, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        else:
+            body = json.dumps(records, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+        # Drop the chunk's own brackets and splice it into the outer array
+        yield (b',' if start else b'') + body[1:-1]
+    yield b']'
+
 def load_model():
     """Load the trained Isolation Forest model."""
     if not os.path.exists(MODEL_FILE):
-        logger.warning(f"Model file not found: {MODEL_FILE}")
+        logger.warning("Model file not found: %s", MODEL_FILE)
         return None
     
     try:
-        model = joblib.load(MODEL_FILE)
+        # Memory-map the (uncompressed) arrays instead of copying them onto the heap
+        model = joblib.load(MODEL_FILE, mmap_mode='r')
         logger.info("Model loaded successfully")
         return model
     except Exception as e:
-        logger.error(f"Error loading model: {e}")
+        logger.error("Error loading model: %s", e)
         return None
 
+def load_precomputed_shap() -> Optional[Dict[str, Any]]:
+    """
+    Load the SHAP values saved by model training for the flagged events.
+    Ignored when missing or older than the model file (i.e. from another model).
+    """
+    shap_file = Path(MODEL_FILE).parent / "shap_values.npz"
+    try:
+        if not shap_file.exists() or not os.path.exists(MODEL_FILE):
+            return None
+        if shap_file.stat().st_mtime < os.stat(MODEL_FILE).st_mtime:
+            logger.warning("Ignoring precomputed SHAP values older than the model: %s", shap_file)
+            return None
+        
+        with np.load(shap_file, allow_pickle=False) as data:
+            precomputed = {
+                'index': {event_id: i for i, event_id in enumerate(data['event_id'].tolist())},
+                'shap_values': data['shap_values'],
+                'base_value': float(data['base_value']),
+                'features': data['features'].tolist()
+            }
+        logger.info("Loaded precomputed SHAP values for %d events", len(precomputed['index']))
+        return precomputed
+    except Exception as e:
+        logger.error("Error loading precomputed SHAP values: %s", e)
+        return None
+
+@functools.lru_cache(maxsize=1)
+def _read_metrics_file(path: str, mtime_ns: int) -> Dict:
+    """Parse the metrics JSON; keyed on mtime so reloads skip an unchanged file."""
+    with open(path, 'r') as f:
+        metrics = json.load(f)
+    logger.info("Loaded metrics from %s", path)
+    return metrics
+
 def load_model_metrics():
     """Load or calculate model metrics."""
     try:
@@ -239,16 +603,13 @@ def load_model_metrics():
             metrics_file = Path(MODEL_FILE).parent / "model_metrics.json"
         
         if metrics_file.exists():
-            with open(metrics_file, 'r') as f:
-                metrics = json.load(f)
-                logger.info(f"Loaded metrics from {metrics_file}")
-                return metrics
+            return _read_metrics_file(str(metrics_file), metrics_file.stat().st_mtime_ns)
         else:
-            logger.warning(f"Metrics file not found: {metrics_file}")
+            logger.warning("Metrics file not found: %s", metrics_file)
             logger.warning("Run model training to generate metrics.")
             return None
     except Exception as e:
-        logger.error(f"Error loading metrics: {e}")
+        logger.error("Error loading metrics: %s", e)
         return None
 
 # =============================================================================
@@ -266,7 +627,134 @@ async def startup_event():
         else:
             logger.warning("⚠️ API started but data/model not available")
     except Exception as e:
-        logger.error(f"❌ Error during startup: {e}")
+        logger.error("❌ Error during startup: %s", e)
+
+# =============================================================================
+# HTTP CACHING
+# =============================================================================
+
+def data_identity() -> str:
+    """
+    Fingerprint of the files DataStore.load reads (size and mtime of each).
+    The same on every worker process and across restarts serving the same
+    files, unlike a per-process load counter.
+    """
+    metrics_file = Path(MODEL_FILE).parent / "model_metrics.json"
+    parts = [file_stamp(path) for path in (MODEL_FILE, PROCESSED_DATA_FILE, metrics_file)]
+    return hashlib.blake2b("|".join(parts).encode(), digest_size=8).hexdigest()
+
+def cache_validators(request: Request, response: Response):
+    """
+    ETag/Cache-Control for responses that only change when the served files do.
+    Answers a matching If-None-Match with 304 and no body.
+    """
+    etag = f'"{data_store.snapshot.identity}-{request.url.path}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=60"}
+    
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")]:
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    response.headers.update(headers)
+
+# =============================================================================
+# EXPLANATION BATCHING
+# =============================================================================
+
+def feature_positions(df: pd.DataFrame, features: List[str]) -> np.ndarray:
+    """Column positions of features in df; raises KeyError naming any that are missing."""
+    positions = df.columns.get_indexer(features)
+    if (positions < 0).any():
+        # get_indexer marks missing labels with -1, which iloc would read as the last column
+        missing = [feature for feature, pos in zip(features, positions) if pos < 0]
+        raise KeyError(f"Processed data is missing feature columns: {missing}")
+    return positions
+
+def explain_event_batch(event_ids: List[str]) -> List[Optional[Dict]]:
+    """SHAP explanations for the given events in one explainer call; None for unknown IDs."""
+    from src.xai_explainer import explain_events
+    from src.model_train import MODEL_FEATURES
+    
+    snapshot = data_store.snapshot
+    df, event_index, explainer = snapshot.df, snapshot.event_index, snapshot.get_explainer()
+    positions = [event_index.get(event_id) for event_id in event_ids]
+    found = [i for i, pos in enumerate(positions) if pos is not None]
+    
+    results: List[Optional[Dict]] = [None] * len(event_ids)
+    if found:
+        # One 2-D take of just the feature cells; no full-width rows are materialized
+        X_explain = df.iloc[[positions[i] for i in found], feature_positions(df, MODEL_FEATURES)]
+        explanations = explain_events(X_explain, [event_ids[i] for i in found], explainer)
+        for i, explanation in zip(found, explanations):
+            results[i] = explanation
+    return results
+
+def precomputed_explanation(event_id: str, snapshot: DataSnapshot) -> Optional[Dict]:
+    """Explanation built from the SHAP values saved at training time, if the event has them."""
+    precomputed = snapshot.precomputed_shap
+    if precomputed is None:
+        return None
+    shap_row = precomputed['index'].get(event_id)
+    position = snapshot.event_index.get(event_id)
+    if shap_row is None or position is None:
+        return None
+    
+    from src.xai_explainer import format_explanation
+    
+    df = snapshot.df
+    features = precomputed['features']
+    feature_row = df.iloc[position, feature_positions(df, features)].to_numpy(dtype=float)
+    return format_explanation(
+        event_id, precomputed['shap_values'][shap_row], feature_row,
+        precomputed['base_value'], features
+    )
+
+class ExplainBatcher:
+    """
+    Coalesces concurrent /explain requests. A single worker task drains up to
+    max_batch queued event IDs and explains them with one SHAP call, so bursts
+    pay the per-call overhead once per batch instead of once per request.
+    """
+    
+    def __init__(self, max_batch: int = 32):
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def explain(self, event_id: str) -> Optional[Dict]:
+        """Queue an event for the next batch and wait for its explanation."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            # (Re)start on the serving loop, e.g. after the app is restarted in-process
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        
+        future = loop.create_future()
+        self._queue.put_nowait((event_id, future))
+        return await future
+    
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            
+            try:
+                results = await asyncio.to_thread(explain_event_batch, [event_id for event_id, _ in batch])
+            except Exception as e:
+                # Every waiter gets the error; None is reserved for unknown event IDs
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+explain_batcher = ExplainBatcher()
 
 # =============================================================================
 # API ENDPOINTS
@@ -295,28 +783,32 @@ def root():
 def health_check():
     """Returns detailed system health status."""
     try:
-        data_loaded = data_store.is_loaded()
-        model_exists = os.path.exists(MODEL_FILE)
-        data_exists = os.path.exists(PROCESSED_DATA_FILE)
+        snapshot = data_store.snapshot
+        data_loaded = snapshot.is_loaded()
+        model_exists = file_exists_cached(MODEL_FILE)
+        data_exists = file_exists_cached(PROCESSED_DATA_FILE)
         
-        total_events = len(data_store.df) if data_store.df is not None else None
+        total_events = len(snapshot.df) if snapshot.df is not None else None
         high_risk = None
         
-        if data_store.df is not None:
-            high_risk = len(data_store.df[data_store.df['risk_level'] == 'High'])
+        if snapshot.df is not None:
+            # High rows are already collected (sorted) at load time
+            high_risk = len(snapshot.risk_orders['High'])
         
-        return HealthStatus(
-            status="healthy" if data_loaded else "degraded",
-            timestamp=datetime.now().isoformat(),
-            data_loaded=data_loaded,
-            model_loaded=data_store.model is not None,
-            total_events=total_events,
-            high_risk_events=high_risk,
-            model_file_exists=model_exists,
-            processed_data_exists=data_exists
-        )
+        # Probed constantly and built from plain ints/bools: send the HealthStatus
+        # fields directly instead of validating a model and re-serializing it
+        return DefaultResponse(content={
+            "status": "healthy" if data_loaded else "degraded",
+            "timestamp": datetime.now().isoformat(),
+            "data_loaded": data_loaded,
+            "model_loaded": snapshot.model is not None,
+            "total_events": total_events,
+            "high_risk_events": high_risk,
+            "model_file_exists": model_exists,
+            "processed_data_exists": data_exists
+        })
     except Exception as e:
-        logger.error(f"Health check error: {e}")
+        logger.error("Health check error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/risks", response_model=List[RiskEvent], summary="Get All Risk Events")
@@ -332,40 +824,48 @@ def get_risk_events(
     - **limit**: Maximum number of events to return (optional)
     - **offset**: Number of events to skip (pagination)
     """
-    if not data_store.is_loaded():
+    snapshot = data_store.snapshot
+    if not snapshot.is_loaded():
         raise HTTPException(
             status_code=503,
             detail="Service data not loaded. Run /pipeline/generate-data first."
         )
     
-    df = data_store.df
+    df = snapshot.df
+    
+    if risk_level and risk_level not in ['High', 'Medium', 'Low']:
+        raise HTTPException(status_code=400, detail="Invalid risk_level. Use 'High', 'Medium', or 'Low'")
+    
+    # Hot pages were serialized at load time
+    prebuilt = snapshot.prebuilt_pages.get((risk_level or None, limit, offset))
+    if prebuilt is not None:
+        return Response(content=prebuilt, media_type="application/json")
     
     # Filter by risk level if specified
     if risk_level:
-        if risk_level not in ['High', 'Medium', 'Low']:
-            raise HTTPException(status_code=400, detail="Invalid risk_level. Use 'High', 'Medium', or 'Low'")
-        df = df[df['risk_level'] == risk_level]
+        order = snapshot.risk_orders[risk_level]
     else:
         # Default: show Medium and High risks
-        df = df[df['risk_level'].isin(['Medium', 'High'])]
-    
-    # Sort by anomaly score descending
-    df = df.sort_values(by='anomaly_score', ascending=False)
+        order = snapshot.risk_orders[None]
     
     # Apply pagination
     if limit:
-        df = df.iloc[offset:offset + limit]
+        order = order[offset:offset + limit]
     else:
-        df = df.iloc[offset:]
+        order = order[offset:]
     
-    if df.empty:
+    if len(order) == 0:
         return []
     
-    alerts_list = df[[
-        'event_id', 'user_id', 'timestamp', 'anomaly_score', 'risk_level', 'anomaly_flag_truth'
-    ]].to_dict('records')
+    # Big pages go out chunk by chunk so peak memory does not grow with limit
+    if len(order) > RISK_STREAM_CHUNK:
+        return StreamingResponse(stream_event_records(df, order), media_type="application/json")
+    
+    alerts_list = events_to_records(df, order)
     
-    return alerts_list
+    # Rows are built from trusted columns; returning a Response skips re-validating
+    # each one against RiskEvent (response_model still documents the schema)
+    return DefaultResponse(content=alerts_list)
 
 @app.get("/risks/user/{user_id}", response_model=UserRiskSummary, summary="Get User Risk Summary")
 def get_user_risks(user_id: str, limit: int = 10):
@@ -375,129 +875,211 @@ def get_user_risks(user_id: str, limit: int = 10):
     - **user_id**: User ID to analyze
     - **limit**: Number of recent events to include
     """
-    if not data_store.is_loaded():
+    snapshot = data_store.snapshot
+    if not snapshot.is_loaded():
         raise HTTPException(status_code=503, detail="Service data not loaded")
     
-    user_df = data_store.df[data_store.df['user_id'] == user_id]
+    rows = snapshot.user_index.get(user_id)
     
-    if user_df.empty:
+    if rows is None:
         raise HTTPException(status_code=404, detail=f"User {user_id} not found")
     
-    # Calculate statistics
-    total_events = len(user_df)
-    high_risk = len(user_df[user_df['risk_level'] == 'High'])
-    medium_risk = len(user_df[user_df['risk_level'] == 'Medium'])
-    low_risk = len(user_df[user_df['risk_level'] == 'Low'])
-    avg_score = float(user_df['anomaly_score'].mean())
-    max_score = float(user_df['anomaly_score'].max())
-    
-    # Get recent events
-    recent = user_df.sort_values(by='timestamp', ascending=False).head(limit)
-    recent_events = recent[[
-        'event_id', 'user_id', 'timestamp', 'anomaly_score', 'risk_level', 'anomaly_flag_truth'
-    ]].to_dict('records')
-    
-    return UserRiskSummary(
-        user_id=user_id,
-        total_events=total_events,
-        high_risk_events=high_risk,
-        medium_risk_events=medium_risk,
-        low_risk_events=low_risk,
-        average_anomaly_score=avg_score,
-        max_anomaly_score=max_score,
-        recent_events=recent_events
-    )
+    # Rows are stored most recent first, so the recent events are a prefix
+    recent_events = events_to_records(snapshot.df, rows[:limit])
+    
+    # Counts and score statistics are precomputed at load time. Like /risks, the
+    # rows come from trusted columns, so skip per-event validation against RiskEvent.
+    return DefaultResponse(content={
+        'user_id': user_id,
+        **snapshot.user_stats[user_id],
+        'recent_events': recent_events
+    })
 
-@app.get("/explain/{event_id}", response_model=ExplanationResponse, summary="Get SHAP Explanation")
-def get_explanation(event_id: str):
+# Explanations only change when the data/model reload, so they are kept per load
+EXPLANATION_CACHE_SIZE = 4096
+
+@app.get("/explain/{event_id}", response_model=ExplanationResponse, summary="Get SHAP Explanation",
+         dependencies=[Depends(cache_validators)])
+async def get_explanation(event_id: str, response: Response):
     """
     Generates SHAP explanation for a specific event.
     
     - **event_id**: The event ID to explain
     """
-    if not data_store.is_loaded():
+    snapshot = data_store.snapshot
+    if not snapshot.is_loaded():
         raise HTTPException(status_code=503, detail="Service data not loaded")
     
-    try:
-        explanation_result = xai_pipeline(event_id=event_id)
-        
-        if explanation_result is None:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Event ID {event_id} not found or explanation generation failed"
-            )
-        
-        return explanation_result
+    explanations = snapshot.explanations
+    explanation_result = explanations.get(event_id)
+    if explanation_result is not None:
+        explanations.move_to_end(event_id)
+    elif event_id in snapshot.event_index:
+        # Flagged events were explained at training time; anything else is
+        # explained together with any other requests that arrive meanwhile
+        try:
+            explanation_result = precomputed_explanation(event_id, snapshot)
+            if explanation_result is None:
+                explanation_result = await explain_batcher.explain(event_id)
+        except Exception as e:
+            logger.error("Explanation error: %s", e, exc_info=True)
+            raise HTTPException(status_code=500, detail=f"Error generating explanation: {str(e)}")
+        # A reload during the wait publishes a new snapshot; never store stale results in its cache
+        if explanation_result is not None and snapshot is data_store.snapshot:
+            explanations[event_id] = explanation_result
+            if len(explanations) > EXPLANATION_CACHE_SIZE:
+                explanations.popitem(last=False)
     
-    except Exception as e:
-        logger.error(f"Explanation error: {e}\n{traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail=f"Error generating explanation: {str(e)}")
+    if explanation_result is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Event ID {event_id} not found or explanation generation failed"
+        )
+    
+    # Built from native floats/bools by explain_events; skip re-validation.
+    # Returning a Response bypasses the injected one, so carry its cache headers over.
+    return DefaultResponse(content=explanation_result, headers=dict(response.headers))
 
-@app.get("/metrics", response_model=ModelMetrics, summary="Get Model Performance Metrics")
+@app.get("/metrics", response_model=ModelMetrics, summary="Get Model Performance Metrics",
+         dependencies=[Depends(cache_validators)])
 def get_metrics():
     """Returns model performance metrics if available."""
-    if not data_store.is_loaded():
+    snapshot = data_store.snapshot
+    if not snapshot.is_loaded():
         raise HTTPException(status_code=503, detail="Service data not loaded")
     
-    metrics = load_model_metrics()
+    # Read once per load alongside the model
+    metrics = snapshot.metrics
     
     if metrics is None:
-        # Calculate basic metrics from data
-        df = data_store.df
-        total_events = len(df)
-        total_anomalies = int(df['anomaly_flag_truth'].sum())
-        
-        return ModelMetrics(
-            auc_roc=0.0,
-            f1_anomaly=0.0,
-            precision_anomaly=0.0,
-            recall_anomaly=0.0,
-            total_events=total_events,
-            total_anomalies=total_anomalies,
-            model_last_trained=None
-        )
+        # Basic metrics from the data, counted once per load
+        return {
+            'auc_roc': 0.0,
+            'f1_anomaly': 0.0,
+            'precision_anomaly': 0.0,
+            'recall_anomaly': 0.0,
+            'total_events': snapshot.total_events,
+            'total_anomalies': snapshot.total_anomalies,
+            'model_last_trained': None
+        }
     
-    return ModelMetrics(**metrics)
+    return metrics
 
 # =============================================================================
 # PIPELINE ENDPOINTS
 # =============================================================================
 
-@app.post("/pipeline/generate-data", response_model=PipelineStatus, summary="Generate Synthetic Data")
-def pipeline_generate_data(background_tasks: BackgroundTasks):
-    """
-    Triggers synthetic data generation.
-    This will create raw_behavior_logs.csv with synthetic insider threat data.
-    """
+# Pipeline steps rewrite the same CSV/model files, so runs never overlap.
+# The steps are CPU-bound pandas/sklearn work; they run in a separate process so
+# they hold neither the event loop nor this process's GIL while requests are served.
+pipeline_lock = asyncio.Lock()
+_pipeline_pool: Optional[ProcessPoolExecutor] = None
+
+def get_pipeline_pool() -> ProcessPoolExecutor:
+    """Lazily start the single pipeline worker process."""
+    global _pipeline_pool
+    if _pipeline_pool is None:
+        # spawn rather than fork: the API process already runs loader/to_thread workers
+        _pipeline_pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    return _pipeline_pool
+
+async def run_pipeline_step(step):
+    """Run a module-level pipeline function in the worker process."""
+    global _pipeline_pool
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_pipeline_pool(), step)
+    except BrokenProcessPool:
+        # The worker died (e.g. OOM); start a fresh one for the next run
+        _pipeline_pool = None
+        raise
+
+@app.on_event("shutdown")
+def shutdown_pipeline_pool():
+    """Stop the pipeline worker process, if one was started."""
+    global _pipeline_pool
+    if _pipeline_pool is not None:
+        _pipeline_pool.shutdown(wait=False, cancel_futures=True)
+        _pipeline_pool = None
+
+# Status of background pipeline tasks, oldest first; only the most recent are kept.
+# Held in this process's memory only: it is lost on restart, and with several
+# workers each one knows only the tasks it accepted.
+pipeline_tasks: "OrderedDict[str, PipelineStatus]" = OrderedDict()
+PIPELINE_TASK_HISTORY = 100
+
+def record_pipeline_task(task_id: str, task: str, task_status: str, message: str):
+    """Store the latest status of a background pipeline task."""
+    pipeline_tasks[task_id] = PipelineStatus(
+        task=task,
+        status=task_status,
+        message=message,
+        timestamp=datetime.now().isoformat(),
+        task_id=task_id
+    )
+    while len(pipeline_tasks) > PIPELINE_TASK_HISTORY:
+        pipeline_tasks.popitem(last=False)
+
+async def generate_data_task(task_id: str):
+    """Background body of /pipeline/generate-data."""
     try:
+        from src.data_generator import generate_synthetic_logs
+        
         logger.info("Starting data generation...")
-        generate_synthetic_logs()
+        async with pipeline_lock:
+            record_pipeline_task(task_id, "generate_data", "running", "Data generation in progress")
+            output_file = await run_pipeline_step(generate_synthetic_logs)
         
-        return PipelineStatus(
-            task="generate_data",
-            status="completed",
-            message=f"Successfully generated synthetic data at {RAW_DATA_FILE}",
-            timestamp=datetime.now().isoformat()
+        record_pipeline_task(
+            task_id, "generate_data", "completed",
+            f"Successfully generated synthetic data at {output_file}"
         )
     except Exception as e:
-        logger.error(f"Data generation failed: {e}\n{traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail=f"Data generation failed: {str(e)}")
+        logger.error("Data generation failed: %s", e, exc_info=True)
+        record_pipeline_task(task_id, "generate_data", "failed", f"Data generation failed: {str(e)}")
+
+@app.post("/pipeline/generate-data", response_model=PipelineStatus, status_code=status.HTTP_202_ACCEPTED,
+          summary="Generate Synthetic Data")
+async def pipeline_generate_data(background_tasks: BackgroundTasks):
+    """
+    Triggers synthetic data generation in the background.
+    Writes the raw synthetic insider threat logs: raw_behavior_logs.parquet when
+    pyarrow is installed, otherwise raw_behavior_logs.csv.
+    Poll /pipeline/tasks/{task_id} for completion.
+    """
+    task_id = uuid.uuid4().hex
+    record_pipeline_task(task_id, "generate_data", "accepted", "Data generation queued")
+    background_tasks.add_task(generate_data_task, task_id)
+    return pipeline_tasks[task_id]
+
+@app.get("/pipeline/tasks/{task_id}", response_model=PipelineStatus, summary="Get Pipeline Task Status")
+def pipeline_task_status(task_id: str):
+    """
+    Returns the status of a background pipeline task.
+    Task history is kept in memory and does not survive a restart.
+    """
+    if task_id not in pipeline_tasks:
+        raise HTTPException(status_code=404, detail=f"Pipeline task '{task_id}' not found")
+    return pipeline_tasks[task_id]
 
 @app.post("/pipeline/engineer-features", response_model=PipelineStatus, summary="Engineer Features")
-def pipeline_engineer_features():
+async def pipeline_engineer_features():
     """
     Triggers feature engineering pipeline.
     This processes raw data and creates processed_features.csv.
     """
-    if not os.path.exists(RAW_DATA_FILE):
+    if not raw_data_exists():
         raise HTTPException(
             status_code=404,
             detail="Raw data file not found. Run /pipeline/generate-data first."
         )
     
     try:
+        from src.feature_engineer import feature_engineering_pipeline
+        
         logger.info("Starting feature engineering...")
-        feature_engineering_pipeline()
+        async with pipeline_lock:
+            await run_pipeline_step(feature_engineering_pipeline)
         
         return PipelineStatus(
             task="engineer_features",
@@ -506,11 +1088,11 @@ def pipeline_engineer_features():
             timestamp=datetime.now().isoformat()
         )
     except Exception as e:
-        logger.error(f"Feature engineering failed: {e}\n{traceback.format_exc()}")
+        logger.error("Feature engineering failed: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Feature engineering failed: {str(e)}")
 
 @app.post("/pipeline/train-model", response_model=PipelineStatus, summary="Train Anomaly Detection Model")
-def pipeline_train_model():
+async def pipeline_train_model():
     """
     Triggers model training pipeline.
     This trains the Isolation Forest model and saves it.
@@ -522,11 +1104,14 @@ def pipeline_train_model():
         )
     
     try:
-        logger.info("Starting model training...")
-        model_training_pipeline()
+        from src.model_train import model_training_pipeline
         
-        # Reload data and model
-        data_store.reload()
+        logger.info("Starting model training...")
+        async with pipeline_lock:
+            await run_pipeline_step(model_training_pipeline)
+            
+            # Reload data and model
+            await data_store.reload()
         
         return PipelineStatus(
             task="train_model",
@@ -535,11 +1120,11 @@ def pipeline_train_model():
             timestamp=datetime.now().isoformat()
         )
     except Exception as e:
-        logger.error(f"Model training failed: {e}\n{traceback.format_exc()}")
+        logger.error("Model training failed: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Model training failed: {str(e)}")
 
 @app.post("/pipeline/run-all", response_model=List[PipelineStatus], summary="Run Full Pipeline")
-def pipeline_run_all():
+async def pipeline_run_all():
     """
     Runs the complete pipeline: Data Generation → Feature Engineering → Model Training.
     This is a comprehensive workflow that may take several minutes.
@@ -547,44 +1132,49 @@ def pipeline_run_all():
     results = []
     
     try:
-        # Step 1: Generate Data
-        logger.info("Pipeline Step 1: Generating data...")
-        generate_synthetic_logs()
-        results.append(PipelineStatus(
-            task="generate_data",
-            status="completed",
-            message="Data generation successful",
-            timestamp=datetime.now().isoformat()
-        ))
-        
-        # Step 2: Engineer Features
-        logger.info("Pipeline Step 2: Engineering features...")
-        feature_engineering_pipeline()
-        results.append(PipelineStatus(
-            task="engineer_features",
-            status="completed",
-            message="Feature engineering successful",
-            timestamp=datetime.now().isoformat()
-        ))
-        
-        # Step 3: Train Model
-        logger.info("Pipeline Step 3: Training model...")
-        model_training_pipeline()
-        results.append(PipelineStatus(
-            task="train_model",
-            status="completed",
-            message="Model training successful",
-            timestamp=datetime.now().isoformat()
-        ))
+        from src.data_generator import generate_synthetic_logs
+        from src.feature_engineer import feature_engineering_pipeline
+        from src.model_train import model_training_pipeline
         
-        # Reload data and model
-        data_store.reload()
+        async with pipeline_lock:
+            # Step 1: Generate Data
+            logger.info("Pipeline Step 1: Generating data...")
+            await run_pipeline_step(generate_synthetic_logs)
+            results.append(PipelineStatus(
+                task="generate_data",
+                status="completed",
+                message="Data generation successful",
+                timestamp=datetime.now().isoformat()
+            ))
+            
+            # Step 2: Engineer Features
+            logger.info("Pipeline Step 2: Engineering features...")
+            await run_pipeline_step(feature_engineering_pipeline)
+            results.append(PipelineStatus(
+                task="engineer_features",
+                status="completed",
+                message="Feature engineering successful",
+                timestamp=datetime.now().isoformat()
+            ))
+            
+            # Step 3: Train Model
+            logger.info("Pipeline Step 3: Training model...")
+            await run_pipeline_step(model_training_pipeline)
+            results.append(PipelineStatus(
+                task="train_model",
+                status="completed",
+                message="Model training successful",
+                timestamp=datetime.now().isoformat()
+            ))
+            
+            # Reload data and model
+            await data_store.reload()
         
         logger.info("✅ Full pipeline completed successfully")
         return results
         
     except Exception as e:
-        logger.error(f"Pipeline execution failed: {e}\n{traceback.format_exc()}")
+        logger.error("Pipeline execution failed: %s", e, exc_info=True)
         results.append(PipelineStatus(
             task="pipeline_run_all",
             status="failed",
@@ -594,17 +1184,19 @@ def pipeline_run_all():
         raise HTTPException(status_code=500, detail=f"Pipeline failed: {str(e)}")
 
 @app.post("/reload", summary="Reload Data and Model")
-def reload_data():
+async def reload_data():
     """Forces a reload of data and model from disk."""
     try:
-        data_store.reload()
+        # Never read the processed CSV or model while a pipeline step rewrites them
+        async with pipeline_lock:
+            await data_store.reload()
         return {
             "status": "success",
             "message": "Data and model reloaded successfully",
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
-        logger.error(f"Reload failed: {e}")
+        logger.error("Reload failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Reload failed: {str(e)}")
 
 # =============================================================================
@@ -613,4 +1205,20 @@ def reload_data():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    # reload and workers both need the import string rather than the app object.
+    # API_RELOAD=1 gives the single-process auto-reloading dev server; otherwise
+    # run WEB_CONCURRENCY workers (default: 1). The DataStore, pipeline_lock, the
+    # pipeline task registry and /reload are all per process, so more than one
+    # worker serves stale data after a reload and can run pipelines concurrently.
+    # loop/http "auto" pick uvloop and httptools when installed (uvicorn[standard])
+    # and fall back to asyncio/h11 otherwise.
+    dev_reload = os.getenv("API_RELOAD", "0").lower() in ("1", "true", "yes")
+    uvicorn.run(
+        "src.api.main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=dev_reload,
+        workers=None if dev_reload else int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop="auto",
+        http="auto",
+    )
\ No newline at end of file
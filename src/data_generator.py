@@ -1,10 +1,15 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta, time
+from datetime import datetime
 import os
-import random
 import sys # <-- NEW: Import sys for path modification
 
+try:
+    import pyarrow  # noqa: F401  (Parquet engine for the raw logs)
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
 # --- PATH CORRECTION FOR LOCAL MODULES ---
 # This block is essential because config.py is in the parent directory (project root)
 # and python running from a subdirectory needs to know where to find it.
@@ -27,103 +32,153 @@ from config import (
     RAW_DATA_FILE, DATA_DIR, NORMAL_START_TIME, NORMAL_END_TIME
 )
 
+try:
+    from config import RAW_DATA_FORMAT
+except ImportError:
+    RAW_DATA_FORMAT = 'csv'
+
 # Ensure the data directory exists
 os.makedirs(DATA_DIR, exist_ok=True)
 
-def generate_synthetic_logs():
-    """Generates a synthetic dataset of user security logs."""
+RAW_PARQUET_FILE = os.path.splitext(RAW_DATA_FILE)[0] + '.parquet'
+
+# Anomalous activity hours: the deep night window (8 PM to 7 AM) and the
+# immediate post-work/pre-work fringe
+NIGHT_HOURS = np.array(list(range(20, 24)) + list(range(0, 7)))
+FRINGE_HOURS = np.array(list(range(7, 8)) + list(range(18, 20)))
+
+def raw_data_path():
+    """Returns the current raw logs file: the Parquet copy if present and readable, else the CSV."""
+    if PARQUET_AVAILABLE and os.path.exists(RAW_PARQUET_FILE):
+        return RAW_PARQUET_FILE
+    return RAW_DATA_FILE
+
+def read_raw_logs(path=None):
+    """Loads the raw logs written by generate_synthetic_logs, whichever format they are in."""
+    path = path or raw_data_path()
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path, engine='pyarrow')
+    # Use 'low_memory=False' for potentially large synthetic datasets
+    return pd.read_csv(path, low_memory=False)
+
+
+def generate_synthetic_logs(seed=None):
+    """
+    Generates a synthetic dataset of user security logs.
+    
+    Args:
+        seed: Optional seed (e.g. config.RANDOM_STATE) for a reproducible dataset;
+              None draws fresh data on every run
+    """
+    
+    # One generator for every draw; each field is sampled for all events at once
+    rng = np.random.default_rng(seed)
     
     # 1. Define User IDs
-    user_ids = [f"user_{i:03d}" for i in range(NUM_USERS)]
+    user_ids = np.array([f"user_{i:03d}" for i in range(NUM_USERS)])
     
     # 2. Define Time Range
     start_date = datetime(2025, 11, 1)
     # The end date is determined by the number of days specified in config
     # end_date = start_date + timedelta(days=NUM_DAYS) # Not strictly needed here
     
-    all_events = []
-    
     print(f"Generating data for {NUM_USERS} users over {NUM_DAYS} days...")
 
-    # --- Data Generation Loop ---
-    for user_id in user_ids:
-        # Simulate a personalized baseline (e.g., slightly higher/lower file access)
-        user_baseline_events = int(np.random.normal(BASE_EVENTS_PER_DAY, 1))
-
-        for day in range(NUM_DAYS):
-            current_date = start_date + timedelta(days=day)
-            
-            # Use random variation for event count based on user baseline
-            num_events = int(np.random.normal(user_baseline_events, 2))
-            
-            for _ in range(max(1, num_events)):
-                # Determine if this event should be an anomaly
-                is_anomaly = random.random() < ANOMALY_RATE
-                
-                # --- Timestamp Generation ---
-                if is_anomaly:
-                    # Anomaly: Time outside normal hours (e.g., 8 PM to 7 AM)
-                    if random.random() < 0.7:
-                        # Deep night window
-                        hour = random.choice(list(range(20, 24)) + list(range(0, 7)))
-                    else:
-                        # Immediate post-work/pre-work unusual time
-                        hour = random.choice(list(range(7, 8)) + list(range(18, 20)))
-                else:
-                    # Normal: Time within normal hours
-                    hour = random.randint(NORMAL_START_TIME.hour, NORMAL_END_TIME.hour)
-                
-                minute = random.randint(0, 59)
-                second = random.randint(0, 59)
-                timestamp = current_date.replace(hour=hour, minute=minute, second=second)
-                
-                # --- Behavior Feature Generation ---
-                event = {
-                    'event_id': f"{user_id}_{timestamp.timestamp()}", # Unique ID for later lookup
-                    'timestamp': timestamp,
-                    'user_id': user_id,
-                    'file_access_count': 0,
-                    'sensitive_file_access': 0,
-                    'upload_size_mb': 0.0,
-                    'external_ip_connection': 0,
-                    'anomaly_flag_truth': 0 # Use a clear name for the ground truth label
-                }
-                
-                if is_anomaly:
-                    # Scenario 1: Data Exfiltration (High upload + Sensitive access)
-                    if random.random() < 0.4:
-                        event['file_access_count'] = random.randint(20, 50) 
-                        event['sensitive_file_access'] = 1                 
-                        event['upload_size_mb'] = np.random.uniform(500, 2000) 
-                        event['anomaly_flag_truth'] = 1
-                    
-                    # Scenario 2: System Reconnaissance (High activity outside hours)
-                    elif random.random() < 0.7:
-                        # Keep time unusual (from timestamp logic) but activity high
-                        event['file_access_count'] = random.randint(30, 80) 
-                        event['upload_size_mb'] = np.random.uniform(0.1, 5)    
-                        event['anomaly_flag_truth'] = 1
-
-                    # Scenario 3: External Access
-                    else:
-                        event['external_ip_connection'] = 1
-                        event['upload_size_mb'] = np.random.uniform(10, 50)
-                        event['anomaly_flag_truth'] = 1
-                
-                # Normal behavior logic 
-                else:
-                    event['file_access_count'] = random.randint(1, 10)
-                    event['upload_size_mb'] = np.random.uniform(0.1, 5)
-                    event['external_ip_connection'] = random.choice([0, 0, 0, 1])
-                
-                all_events.append(event)
+    # --- Event Counts ---
+    # Simulate a personalized baseline (e.g., slightly higher/lower file access)
+    user_baseline_events = rng.normal(BASE_EVENTS_PER_DAY, 1, NUM_USERS).astype(int)
+    
+    # Use random variation for event count based on user baseline, one draw per user-day
+    num_events = rng.normal(user_baseline_events[:, None], 2, (NUM_USERS, NUM_DAYS)).astype(int)
+    num_events = np.maximum(1, num_events)
+    
+    # Lay the events out day by day (every user's events for day 0, then day 1, ...)
+    day_major_counts = num_events.T.ravel()
+    n_total = int(day_major_counts.sum())
+    user_idx = np.repeat(np.tile(np.arange(NUM_USERS), NUM_DAYS), day_major_counts)
+    day_idx = np.repeat(np.repeat(np.arange(NUM_DAYS), NUM_USERS), day_major_counts)
+    day_ends = np.cumsum(num_events.sum(axis=0))
+    day_starts = np.concatenate([[0], day_ends[:-1]])
+    
+    # Determine which events should be anomalies
+    is_anomaly = rng.random(n_total) < ANOMALY_RATE
+    
+    # --- Timestamp Generation ---
+    # Anomaly: Time outside normal hours, 70% in the deep night window
+    anomaly_hour = np.where(
+        rng.random(n_total) < 0.7,
+        NIGHT_HOURS[rng.integers(0, len(NIGHT_HOURS), n_total)],
+        FRINGE_HOURS[rng.integers(0, len(FRINGE_HOURS), n_total)]
+    )
+    
+    # Normal: Time within normal hours
+    normal_hour = rng.integers(NORMAL_START_TIME.hour, NORMAL_END_TIME.hour, n_total, endpoint=True)
+    
+    hour = np.where(is_anomaly, anomaly_hour, normal_hour)
+    minute = rng.integers(0, 60, n_total)
+    second = rng.integers(0, 60, n_total)
+    offset_seconds = day_idx * 86400 + hour * 3600 + minute * 60 + second
+    timestamp = pd.to_datetime(offset_seconds, unit='s', origin=pd.Timestamp(start_date))
+    
+    # --- Behavior Feature Generation ---
+    # Scenario 1: Data Exfiltration (High upload + Sensitive access)
+    # Scenario 2: System Reconnaissance (High activity outside hours)
+    # Scenario 3: External Access
+    scenario = rng.random(n_total)
+    exfil = is_anomaly & (scenario < 0.4)
+    recon = is_anomaly & (scenario >= 0.4) & (scenario < 0.4 + 0.6 * 0.7)
+    external = is_anomaly & ~exfil & ~recon
+    
+    file_access_count = np.select(
+        [exfil, recon, external],
+        [rng.integers(20, 50, n_total, endpoint=True), rng.integers(30, 80, n_total, endpoint=True), 0],
+        default=rng.integers(1, 10, n_total, endpoint=True)
+    )
+    upload_size_mb = np.select(
+        [exfil, external],
+        [rng.uniform(500, 2000, n_total), rng.uniform(10, 50, n_total)],
+        default=rng.uniform(0.1, 5, n_total)
+    )
+    # Normal behavior connects externally a quarter of the time
+    external_ip_connection = np.where(
+        is_anomaly, external, rng.random(n_total) < 0.25
+    ).astype(int)
+    
+    df = pd.DataFrame({
+        'timestamp': timestamp,
+        'user_id': user_ids[user_idx],
+        'file_access_count': file_access_count,
+        'sensitive_file_access': exfil.astype(int),
+        'upload_size_mb': upload_size_mb,
+        'external_ip_connection': external_ip_connection,
+        'anomaly_flag_truth': is_anomaly.astype(int) # Use a clear name for the ground truth label
+    })
     
     # Create DataFrame and save
-    # Convert to pandas DataFrame, sort chronologically, and reset index
-    df = pd.DataFrame(all_events).sort_values(by='timestamp').reset_index(drop=True)
+    # Days are already contiguous and in order, so sorting each day's block by
+    # time gives a chronological log without a global sort
+    order = np.concatenate([
+        start + np.argsort(offset_seconds[start:end], kind='stable')
+        for start, end in zip(day_starts, day_ends)
+    ])
+    df = df.take(order).reset_index(drop=True)
     
-    # Save the file
-    df.to_csv(RAW_DATA_FILE, index=False)
+    # Unique ID for later lookup: user plus chronological sequence number
+    # (second-resolution timestamps can repeat for the same user)
+    sequence = np.arange(len(df)).astype(str)
+    df.insert(0, 'event_id', np.char.add(np.char.add(df['user_id'].to_numpy(dtype=str), '_'), sequence))
+    
+    # Save the file (binary Parquet skips per-value text formatting)
+    if RAW_DATA_FORMAT == 'parquet' and PARQUET_AVAILABLE:
+        output_file, stale_file = RAW_PARQUET_FILE, RAW_DATA_FILE
+        df.to_parquet(output_file, engine='pyarrow', compression='snappy', index=False)
+    else:
+        output_file, stale_file = RAW_DATA_FILE, RAW_PARQUET_FILE
+        df.to_csv(output_file, index=False)
+    
+    # Only one copy of the raw logs may exist, so readers never pick up an old run
+    if os.path.exists(stale_file):
+        os.remove(stale_file)
     
     total_events = len(df)
     actual_anomalies = df['anomaly_flag_truth'].sum()
@@ -131,8 +186,10 @@ def generate_synthetic_logs():
     print(f"✅ Data Generation Complete.")
     print(f"Total events generated: {total_events}")
     print(f"Injected anomalies: {actual_anomalies} ({actual_anomalies/total_events:.2%})")
-    print(f"File saved to: {RAW_DATA_FILE}")
+    print(f"File saved to: {output_file}")
     print("-" * 50)
     
+    return output_file
+    
 if __name__ == "__main__":
     generate_synthetic_logs()
\ No newline at end of file
@@ -16,8 +16,9 @@ Phase: 2A - Core Infrastructure (Session 4)
 
 import pandas as pd
 import numpy as np
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 
 
@@ -139,86 +140,89 @@ class EventChainDetector:
             self.events['timestamp'] = pd.to_datetime(self.events['timestamp'])
             self.events = self.events.sort_values('timestamp')
         
+        # Chains are fixed once detected, so filtered lists and the summary are
+        # built on first request and reused
+        self._chains_by_severity = {}
+        self._summary = None
+        
         self.detected_chains = []
         self._detect_chains()
     
-    def _classify_event(self, event: pd.Series) -> Set[str]:
+    def _classify_events(self) -> List[Tuple[str, ...]]:
         """
-        Classify an event based on its characteristics.
+        Classify every event based on its characteristics.
+        
+        Each rule is evaluated once as a boolean column over all events; tags are
+        then assembled per distinct combination of rules rather than per row.
         
-        Returns a set of tags describing the event (e.g., 'off_hours', 'mass_file_access')
+        Returns a tuple of tags per event (e.g., 'off_hours', 'mass_file_access')
         """
-        tags = set()
-        
-        # Off-hours access (before 6 AM or after 10 PM)
-        if 'hour_of_day' in event:
-            hour = event['hour_of_day']
-            if hour < 6 or hour >= 22:
-                tags.add('off_hours_access')
-                tags.add('off_hours')
-        
-        if event.get('is_off_hours', False):
-            tags.add('off_hours_access')
-            tags.add('off_hours')
-        
-        # Mass file access (>20 files)
-        if 'file_access_count' in event:
-            if event['file_access_count'] > 20:
-                tags.add('mass_file_access')
-            if event['file_access_count'] > 50:
-                tags.add('mass_file_enum')
-        
-        # Large upload (>50 MB)
-        if 'upload_size_mb' in event:
-            if event['upload_size_mb'] > 50:
-                tags.add('large_upload')
-            if event['upload_size_mb'] < 1:
-                tags.add('minimal_upload')
-            if event['upload_size_mb'] > 10:  # Multiple uploads
-                tags.add('repeated_uploads')
-        
-        # Sensitive file access
-        if event.get('sensitive_file_access', 0) > 0:
-            tags.add('sensitive_file_access')
-            tags.add('sensitive_access')
-        
-        # External connection
-        if event.get('external_ip_connection', 0) > 0:
-            tags.add('external_connection')
-        
-        # USB usage
-        if event.get('uses_usb', False):
-            tags.add('usb_usage')
-        
-        # Privilege patterns
-        if event.get('privilege_escalation', False):
-            tags.add('privilege_escalation')
-            tags.add('privilege_use')
-        
-        # Unusual login (new location, new time, etc.)
-        if event.get('is_unusual_login', False):
-            tags.add('unusual_login')
-        
-        # Weekend access
-        if 'day_of_week' in event:
-            if event['day_of_week'] >= 5:  # Saturday or Sunday
-                tags.add('weekend_access')
-        
-        # System access (admin actions, etc.)
-        if event.get('admin_action', False):
-            tags.add('system_access')
-            tags.add('system_modification')
-        
-        # High risk event
-        if 'risk_level' in event:
-            if event['risk_level'] == 'High':
-                tags.add('high_risk_action')
-        
-        # Catch-all for any high-risk indicators
-        if event.get('anomaly_score', 0) < -0.6:
-            tags.add('high_risk_action')
-        
-        return tags
+        events = self.events
+        n = len(events)
+        
+        def numeric(column):
+            # Missing columns never match a threshold (NaN compares False)
+            if column not in events.columns:
+                return np.full(n, np.nan)
+            return events[column].to_numpy(dtype=float, na_value=np.nan)
+        
+        def flag(column):
+            # Same truth test as `if event.get(column, False)`, so NaN counts as set
+            if column not in events.columns:
+                return np.zeros(n, dtype=bool)
+            values = events[column].to_numpy()
+            if values.dtype.kind in 'biuf':
+                return values != 0
+            return np.fromiter((bool(v) for v in values), dtype=bool, count=n)
+        
+        hour = numeric('hour_of_day')
+        files = numeric('file_access_count')
+        upload = numeric('upload_size_mb')
+        if 'risk_level' in events.columns:
+            high_risk = (events['risk_level'] == 'High').to_numpy(dtype=bool, na_value=False)
+        else:
+            high_risk = np.zeros(n, dtype=bool)
+        
+        # (tags, rule) in the order tags are reported
+        rules = [
+            # Off-hours access (before 6 AM or after 10 PM)
+            (('off_hours_access', 'off_hours'), (hour < 6) | (hour >= 22) | flag('is_off_hours')),
+            # Mass file access (>20 files)
+            (('mass_file_access',), files > 20),
+            (('mass_file_enum',), files > 50),
+            # Large upload (>50 MB)
+            (('large_upload',), upload > 50),
+            (('minimal_upload',), upload < 1),
+            (('repeated_uploads',), upload > 10),  # Multiple uploads
+            # Sensitive file access
+            (('sensitive_file_access', 'sensitive_access'), numeric('sensitive_file_access') > 0),
+            # External connection
+            (('external_connection',), numeric('external_ip_connection') > 0),
+            # USB usage
+            (('usb_usage',), flag('uses_usb')),
+            # Privilege patterns
+            (('privilege_escalation', 'privilege_use'), flag('privilege_escalation')),
+            # Unusual login (new location, new time, etc.)
+            (('unusual_login',), flag('is_unusual_login')),
+            # Weekend access (Saturday or Sunday)
+            (('weekend_access',), numeric('day_of_week') >= 5),
+            # System access (admin actions, etc.)
+            (('system_access', 'system_modification'), flag('admin_action')),
+            # High risk event, or any other high-risk indicator
+            (('high_risk_action',), high_risk | (numeric('anomaly_score') < -0.6)),
+        ]
+        
+        # One bit per rule; events with the same bits share one tags tuple
+        codes = np.zeros(n, dtype=np.int64)
+        for bit, (_, matched) in enumerate(rules):
+            codes |= matched.astype(np.int64) << bit
+        
+        distinct_codes, inverse = np.unique(codes, return_inverse=True)
+        distinct_tags = [
+            tuple(tag for bit, (tags, _) in enumerate(rules) if code >> bit & 1 for tag in tags)
+            for code in distinct_codes.tolist()
+        ]
+        return [distinct_tags[i] for i in inverse.tolist()]
     
     def _detect_chains(self):
         """
@@ -229,24 +233,55 @@ class EventChainDetector:
         if len(self.events) < 2:
             return  # Need at least 2 events to form a chain
         
-        # Classify all events
-        event_tags = []
-        for idx, event in self.events.iterrows():
-            tags = self._classify_event(event)
-            event_tags.append({
+        # Format ISO timestamps once (vectorized) so serializers never call isoformat() per event
+        timestamps_iso = None
+        if 'timestamp' in self.events.columns:
+            timestamps_us = self.events['timestamp'].to_numpy().astype('datetime64[us]')
+            timestamps_iso = (
+                pd.Series(np.datetime_as_string(timestamps_us, unit='us'))
+                .str.removesuffix('.000000')
+                .tolist()
+            )
+        
+        # Classify all events, reading each field once per column instead of per row
+        events = self.events
+        n = len(events)
+        indexes = events.index.tolist()
+        
+        def column_values(column, default):
+            return events[column].tolist() if column in events.columns else [default] * n
+        
+        timestamps = column_values('timestamp', datetime.now())
+        if timestamps_iso is None:
+            timestamps_iso = [timestamp.isoformat() for timestamp in timestamps]
+        if 'event_id' in events.columns:
+            event_ids = events['event_id'].tolist()
+        else:
+            event_ids = [f'evt_{idx}' for idx in indexes]
+        
+        event_tags = [
+            {
                 'index': idx,
-                'timestamp': event.get('timestamp', datetime.now()),
-                'event_id': event.get('event_id', f'evt_{idx}'),
-                'tags': tags,
-                'anomaly_score': event.get('anomaly_score', 0),
-                'risk_level': event.get('risk_level', 'Low')
-            })
+                'timestamp': timestamp,
+                'timestamp_iso': timestamp_iso,
+                'event_id': event_id,
+                'tags': tags,  # immutable; shared by every chain the event lands in
+                'anomaly_score': anomaly_score,
+                'risk_level': risk_level
+            }
+            for idx, timestamp, timestamp_iso, event_id, tags, anomaly_score, risk_level in zip(
+                indexes, timestamps, timestamps_iso, event_ids, self._classify_events(),
+                column_values('anomaly_score', 0), column_values('risk_level', 'Low')
+            )
+        ]
         
         # Look for pattern matches
+        tag_index = self._build_tag_index(event_tags)
         for pattern_type, pattern_config in self.ATTACK_PATTERNS.items():
             for pattern_def in pattern_config['patterns']:
                 chains = self._find_pattern_matches(
                     event_tags,
+                    tag_index,
                     pattern_def,
                     pattern_type,
                     pattern_config
@@ -256,9 +291,19 @@ class EventChainDetector:
         # Sort chains by risk (highest first)
         self.detected_chains.sort(key=lambda x: x['chain_risk'], reverse=True)
     
+    @staticmethod
+    def _build_tag_index(event_tags: List[Dict]) -> Dict[str, List[int]]:
+        """Inverted index: tag -> sorted positions of the events carrying it."""
+        tag_index = defaultdict(list)
+        for pos, event in enumerate(event_tags):
+            for tag in event['tags']:
+                tag_index[tag].append(pos)
+        return dict(tag_index)
+    
     def _find_pattern_matches(
         self,
         event_tags: List[Dict],
+        tag_index: Dict[str, List[int]],
         pattern_def: Dict,
         pattern_type: str,
         pattern_config: Dict
@@ -267,7 +312,8 @@ class EventChainDetector:
         Find all instances of a specific pattern in the events.
         
         Args:
-            event_tags: List of classified events
+            event_tags: List of classified events (in time order)
+            tag_index: Tag -> event positions (see _build_tag_index)
             pattern_def: Pattern definition to match
             pattern_type: Type of pattern (e.g., 'data_exfiltration')
             pattern_config: Overall pattern configuration
@@ -279,51 +325,47 @@ class EventChainDetector:
         sequence = pattern_def['sequence']
         max_window = timedelta(hours=pattern_def['max_time_window_hours'])
         
-        # Sliding window approach
-        for i in range(len(event_tags)):
+        def positions_matching(required_tag):
+            # Flexible matching - an event matches if one of its tags contains
+            # or is contained in the required tag
+            positions = set()
+            for tag, tag_positions in tag_index.items():
+                if required_tag in tag or tag in required_tag:
+                    positions.update(tag_positions)
+            return positions
+        
+        # Bit k set: the event can fill sequence position k (k >= 1)
+        position_bits = defaultdict(int)
+        for seq_idx in range(1, len(sequence)):
+            for pos in positions_matching(sequence[seq_idx]):
+                position_bits[pos] |= 1 << seq_idx
+        candidates = sorted(position_bits)
+        all_positions = (1 << len(sequence)) - 2
+        timestamps = [event['timestamp'] for event in event_tags]
+        
+        # Only events that can start the pattern are tried as chain starts
+        for i in sorted(positions_matching(sequence[0])):
             start_event = event_tags[i]
             
-            # Check if this event could start the pattern
-            if not any(tag in start_event['tags'] for tag in [sequence[0], sequence[0].replace('_', ' ')]):
-                # First tag doesn't match - check alternative naming
-                first_tag_match = False
-                for tag in start_event['tags']:
-                    if sequence[0] in tag or tag in sequence[0]:
-                        first_tag_match = True
-                        break
-                if not first_tag_match:
-                    continue
-            
             # Try to match the rest of the sequence
             matched_events = [start_event]
             matched_indices = {0}  # Track which sequence positions are matched
+            matched_bits = 0
             
-            # Look ahead for matching events within time window
-            for j in range(i + 1, len(event_tags)):
-                check_event = event_tags[j]
-                
-                # Check if within time window
-                time_diff = check_event['timestamp'] - start_event['timestamp']
-                if time_diff > max_window:
-                    break  # Too far in time
+            # Look ahead, within the time window, at events matching some sequence position
+            window_end = bisect_right(timestamps, start_event['timestamp'] + max_window, lo=i + 1)
+            for j in candidates[bisect_right(candidates, i):bisect_left(candidates, window_end)]:
+                remaining = position_bits[j] & ~matched_bits
+                if not remaining:
+                    continue
                 
-                # Check if this event matches any remaining sequence position
-                for seq_idx in range(1, len(sequence)):
-                    if seq_idx in matched_indices:
-                        continue  # Already matched
-                    
-                    required_tag = sequence[seq_idx]
-                    # Flexible matching - check if tag contains or is contained
-                    tag_match = False
-                    for event_tag in check_event['tags']:
-                        if required_tag in event_tag or event_tag in required_tag:
-                            tag_match = True
-                            break
-                    
-                    if tag_match:
-                        matched_events.append(check_event)
-                        matched_indices.add(seq_idx)
-                        break  # Matched this event, move to next
+                # Fill the first unmatched sequence position this event matches
+                seq_idx = (remaining & -remaining).bit_length() - 1
+                matched_events.append(event_tags[j])
+                matched_indices.add(seq_idx)
+                matched_bits |= 1 << seq_idx
+                if matched_bits == all_positions:
+                    break  # Nothing left to match
             
             # Check if we matched enough events
             if len(matched_events) >= pattern_def['min_events']:
@@ -343,6 +385,8 @@ class EventChainDetector:
                     'event_count': len(matched_events),
                     'start_time': matched_events[0]['timestamp'],
                     'end_time': matched_events[-1]['timestamp'],
+                    'start_time_iso': matched_events[0]['timestamp_iso'],
+                    'end_time_iso': matched_events[-1]['timestamp_iso'],
                     'duration_hours': (matched_events[-1]['timestamp'] - matched_events[0]['timestamp']).total_seconds() / 3600,
                     'individual_risk_sum': round(sum_risk, 4),
                     'chain_risk': round(amplified_risk, 4),
@@ -388,7 +432,7 @@ class EventChainDetector:
         for idx, event in enumerate(events, 1):
             time_str = event['timestamp'].strftime('%H:%M')
             risk_str = event['risk_level']
-            tags_str = ', '.join(list(event['tags'])[:3])  # Top 3 tags
+            tags_str = ', '.join(event['tags'][:3])  # Top 3 tags
             
             narrative += f"{idx}. [{time_str}] {tags_str} (Risk: {risk_str})\n"
         
@@ -413,15 +457,18 @@ class EventChainDetector:
         if min_severity is None:
             return self.detected_chains
         
-        severity_order = {'Medium': 0, 'High': 1, 'Critical': 2}
-        min_level = severity_order.get(min_severity, 0)
-        
-        filtered = [
-            chain for chain in self.detected_chains
-            if severity_order.get(chain['severity'], 0) >= min_level
-        ]
+        filtered = self._chains_by_severity.get(min_severity)
+        if filtered is None:
+            severity_order = {'Medium': 0, 'High': 1, 'Critical': 2}
+            min_level = severity_order.get(min_severity, 0)
+            
+            filtered = [
+                chain for chain in self.detected_chains
+                if severity_order.get(chain['severity'], 0) >= min_level
+            ]
+            self._chains_by_severity[min_severity] = filtered
         
-        return filtered
+        return list(filtered)
     
     def get_summary(self) -> Dict:
         """
@@ -430,6 +477,12 @@ class EventChainDetector:
         Returns:
             Dictionary with chain statistics
         """
+        if self._summary is None:
+            self._summary = self._build_summary()
+        return dict(self._summary)
+    
+    def _build_summary(self) -> Dict:
+        """Count chains by severity and type and find the riskiest one."""
         if len(self.detected_chains) == 0:
             return {
                 'user_id': self.user_id,
@@ -478,8 +531,11 @@ class ChainDetectorManager:
         self.data_df = data_df
         self.time_window_hours = time_window_hours
         self.detectors = {}
+        self._chains_by_min_severity = {}
+        self._statistics = None
         
         self._detect_all_chains()
+        self._index_chains_by_severity()
     
     def _detect_all_chains(self):
         """Detect chains for all users."""
@@ -487,11 +543,11 @@ class ChainDetectorManager:
             print("Warning: No user_id column. Cannot detect chains.")
             return
         
-        unique_users = self.data_df['user_id'].unique()
+        # One groupby pass partitions the events; a mask scan per user is O(users * events)
+        user_groups = self.data_df.groupby('user_id', sort=False, observed=True)
         
-        print(f"Detecting event chains for {len(unique_users)} users...")
-        for user_id in unique_users:
-            user_events = self.data_df[self.data_df['user_id'] == user_id].copy()
+        print(f"Detecting event chains for {user_groups.ngroups} users...")
+        for user_id, user_events in user_groups:
             self.detectors[user_id] = EventChainDetector(
                 user_id,
                 user_events,
@@ -501,30 +557,47 @@ class ChainDetectorManager:
         total_chains = sum(len(d.detected_chains) for d in self.detectors.values())
         print(f"✅ Detected {total_chains} event chains across all users")
     
+    def _index_chains_by_severity(self):
+        """Pre-sort all chains once and partition them by minimum severity."""
+        severity_order = {'Medium': 0, 'High': 1, 'Critical': 2}
+        
+        all_chains = [chain for d in self.detectors.values() for chain in d.detected_chains]
+        all_chains.sort(key=lambda x: x['chain_risk'], reverse=True)
+        
+        self._chains_by_min_severity = {None: all_chains}
+        for severity, min_level in severity_order.items():
+            self._chains_by_min_severity[severity] = [
+                chain for chain in all_chains
+                if severity_order.get(chain['severity'], 0) >= min_level
+            ]
+    
     def get_detector(self, user_id: str) -> Optional[EventChainDetector]:
         """Get chain detector for specific user."""
         return self.detectors.get(user_id)
     
-    def get_all_chains(self, min_severity: Optional[str] = None) -> List[Dict]:
+    def get_all_chains(self, min_severity: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
         """
         Get all detected chains across all users.
         
         Args:
             min_severity: Minimum severity filter
+            limit: Optional maximum number of chains to return
             
         Returns:
             List of all chains, sorted by risk
         """
-        all_chains = []
-        for detector in self.detectors.values():
-            chains = detector.get_chains(min_severity=min_severity)
-            all_chains.extend(chains)
-        
-        all_chains.sort(key=lambda x: x['chain_risk'], reverse=True)
-        return all_chains
+        # Unknown severities fall back to the lowest level, same as get_chains()
+        chains = self._chains_by_min_severity.get(min_severity, self._chains_by_min_severity['Medium'])
+        return chains[:limit]
     
     def get_statistics(self) -> Dict:
-        """Get overall statistics."""
+        """Get overall statistics (computed once, on first request)."""
+        if self._statistics is None:
+            self._statistics = self._compute_statistics()
+        return dict(self._statistics)
+    
+    def _compute_statistics(self) -> Dict:
+        """Count chains by severity across all users."""
         all_chains = self.get_all_chains()
         
         if len(all_chains) == 0:
@@ -17,9 +17,10 @@ except NameError:
 
 # Import configuration constants
 from config import (
-    RAW_DATA_FILE, PROCESSED_DATA_FILE,
+    PROCESSED_DATA_FILE,
     TIME_WINDOW_HOURS, NORMAL_START_TIME, NORMAL_END_TIME
 )
+from src.data_generator import raw_data_path, read_raw_logs
 
 
 def create_temporal_features(df):
@@ -109,14 +110,14 @@ def feature_engineering_pipeline():
     """
     Main pipeline to load raw data, engineer features, and save the final dataset.
     """
-    if not os.path.exists(RAW_DATA_FILE):
-        print(f"ERROR: Raw data file not found at {RAW_DATA_FILE}")
+    raw_file = raw_data_path()
+    if not os.path.exists(raw_file):
+        print(f"ERROR: Raw data file not found at {raw_file}")
         print("Please ensure you run 'python src/data_generator.py' with the corrected config.py first.")
         return
 
-    print(f"Loading raw data from: {RAW_DATA_FILE}")
-    # Use 'low_memory=False' for potentially large synthetic datasets
-    df = pd.read_csv(RAW_DATA_FILE, low_memory=False)
+    print(f"Loading raw data from: {raw_file}")
+    df = read_raw_logs(raw_file)
 
     # --- Step 1: Temporal Feature Creation ---
     df = create_temporal_features(df)
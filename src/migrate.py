@@ -23,6 +23,7 @@ _root = Path(__file__).resolve().parent.parent
 if str(_root) not in sys.path:
     sys.path.insert(0, str(_root))
 
+import numpy as np
 import pandas as pd
 
 # ---------------------------------------------------------------------------
@@ -35,6 +36,7 @@ except ImportError:
     DB_FILE = str(_root / "data" / "vortex.db")
 
 from src.database import engine
+from src.data_generator import raw_data_path, read_raw_logs
 
 
 # ---------------------------------------------------------------------------
@@ -51,17 +53,13 @@ def migrate_events() -> int:
 
     # Add risk_level if not present (matches main.py logic)
     if "risk_level" not in df.columns:
-        q_low      = df["anomaly_score"].quantile(0.80)
-        q_high     = df["anomaly_score"].quantile(0.95)
-        q_critical = df["anomaly_score"].quantile(0.99)
-
-        def _cat(score):
-            if score >= q_critical: return "Critical"
-            elif score >= q_high:   return "High"
-            elif score >= q_low:    return "Medium"
-            return "Low"
-
-        df["risk_level"] = df["anomaly_score"].apply(_cat)
+        scores     = df["anomaly_score"].to_numpy(dtype=float)
+        thresholds = np.nanquantile(scores, [0.80, 0.95, 0.99])
+        codes      = np.searchsorted(thresholds, scores, side="right")
+        codes[np.isnan(scores)] = 0
+        df["risk_level"] = pd.Categorical.from_codes(
+            codes, categories=["Low", "Medium", "High", "Critical"]
+        )
 
     print(f"  Writing {len(df):,} rows × {len(df.columns)} columns to SQLite ...")
     df.to_sql(
@@ -79,13 +77,14 @@ def migrate_events() -> int:
 # Migration: raw_behavior_logs → raw_events table
 # ---------------------------------------------------------------------------
 def migrate_raw_events() -> int:
-    """Import raw_behavior_logs.csv → raw_events table."""
-    if not os.path.exists(RAW_DATA_FILE):
+    """Import raw_behavior_logs (CSV or Parquet) → raw_events table."""
+    raw_file = raw_data_path()
+    if not os.path.exists(raw_file):
         print(f"  ⚠️  Raw data not found: {RAW_DATA_FILE}")
         return 0
 
-    print(f"  Loading {RAW_DATA_FILE} ...")
-    df = pd.read_csv(RAW_DATA_FILE, low_memory=False)
+    print(f"  Loading {raw_file} ...")
+    df = read_raw_logs(raw_file)
     print(f"  Writing {len(df):,} rows to SQLite ...")
     df.to_sql(
         "raw_events",
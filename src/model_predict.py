@@ -30,7 +30,7 @@ def load_model():
         return None
     
     try:
-        model = joblib.load(MODEL_FILE)
+        model = joblib.load(MODEL_FILE, mmap_mode='r')
         logger.info(f"Model loaded successfully from {MODEL_FILE}")
         return model
     except Exception as e:
@@ -65,6 +65,49 @@ def prepare_features(events: List[Dict[str, Any]]) -> pd.DataFrame:
     
     return X, df
 
+def score_features(model, X: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Score a prepared feature matrix.
+    
+    Args:
+        model: Trained Isolation Forest model
+        X: Feature matrix from prepare_features
+    
+    Returns:
+        Dictionary of per-event result columns (one array per output field)
+    """
+    # Get anomaly scores (decision_function)
+    # Isolation Forest: lower score = more anomalous
+    scores = model.decision_function(X)
+    
+    # Invert scores so higher = more anomalous (for consistency)
+    anomaly_scores = -scores
+    
+    # Get binary predictions (-1 for anomaly, 1 for normal)
+    predictions = model.predict(X)
+    anomaly_flags = np.where(predictions == -1, 1, 0)
+    
+    # Calculate risk levels based on score distribution
+    # Use quantiles from the scores
+    q_low, q_high = np.percentile(anomaly_scores, [80, 95])
+    risk_levels = np.select(
+        [anomaly_scores >= q_high, anomaly_scores >= q_low],
+        ['High', 'Medium'],
+        default='Low'
+    ).astype(object)
+    
+    logger.info(f"Successfully predicted {len(anomaly_scores)} events")
+    logger.info(f"High risk: {int((risk_levels == 'High').sum())}")
+    logger.info(f"Medium risk: {int((risk_levels == 'Medium').sum())}")
+    logger.info(f"Low risk: {int((risk_levels == 'Low').sum())}")
+    
+    return {
+        'anomaly_score': anomaly_scores,
+        'anomaly_flag': anomaly_flags,
+        'risk_level': risk_levels,
+        'prediction_confidence': np.abs(scores)  # Distance from decision boundary
+    }
+
 def predict_anomaly_scores(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Predict anomaly scores for a batch of events.
@@ -82,51 +125,15 @@ def predict_anomaly_scores(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]
     try:
         # Prepare features
         X, df_original = prepare_features(events)
+        columns = score_features(model, X)
         
-        # Get anomaly scores (decision_function)
-        # Isolation Forest: lower score = more anomalous
-        scores = model.decision_function(X)
-        
-        # Invert scores so higher = more anomalous (for consistency)
-        anomaly_scores = -scores
-        
-        # Get binary predictions (-1 for anomaly, 1 for normal)
-        predictions = model.predict(X)
-        anomaly_flags = np.where(predictions == -1, 1, 0)
-        
-        # Calculate risk levels based on score distribution
-        # Use quantiles from the scores
-        q_low = np.percentile(anomaly_scores, 80)
-        q_high = np.percentile(anomaly_scores, 95)
-        
-        def categorize_risk(score):
-            if score >= q_high:
-                return "High"
-            elif score >= q_low:
-                return "Medium"
-            else:
-                return "Low"
-        
-        risk_levels = [categorize_risk(score) for score in anomaly_scores]
-        
-        # Combine results
-        results = []
-        for i, event in enumerate(events):
-            result = {
-                'event_data': event,
-                'anomaly_score': float(anomaly_scores[i]),
-                'anomaly_flag': int(anomaly_flags[i]),
-                'risk_level': risk_levels[i],
-                'prediction_confidence': abs(float(scores[i]))  # Distance from decision boundary
-            }
-            results.append(result)
-        
-        logger.info(f"Successfully predicted {len(results)} events")
-        logger.info(f"High risk: {sum(1 for r in results if r['risk_level'] == 'High')}")
-        logger.info(f"Medium risk: {sum(1 for r in results if r['risk_level'] == 'Medium')}")
-        logger.info(f"Low risk: {sum(1 for r in results if r['risk_level'] == 'Low')}")
-        
-        return results
+        # Combine results, zipping native column lists instead of indexing per event
+        fields = list(columns)
+        values = [columns[field].tolist() for field in fields]
+        return [
+            {'event_data': event, **dict(zip(fields, row))}
+            for event, row in zip(events, zip(*values))
+        ]
         
     except Exception as e:
         logger.error(f"Prediction error: {e}", exc_info=True)
@@ -149,18 +156,15 @@ def predict_from_csv(csv_path: str, output_path: Optional[str] = None) -> pd.Dat
     logger.info(f"Loading data from {csv_path}")
     df = pd.read_csv(csv_path)
     
-    # Convert to list of dictionaries
-    events = df[MODEL_FEATURES].to_dict('records')
-    
-    # Get predictions
-    predictions = predict_anomaly_scores(events)
+    model = load_model()
+    if model is None:
+        raise ValueError("Model not available. Train the model first.")
     
-    # Create results DataFrame
-    results_df = pd.DataFrame([p['event_data'] for p in predictions])
-    results_df['anomaly_score'] = [p['anomaly_score'] for p in predictions]
-    results_df['anomaly_flag'] = [p['anomaly_flag'] for p in predictions]
-    results_df['risk_level'] = [p['risk_level'] for p in predictions]
-    results_df['prediction_confidence'] = [p['prediction_confidence'] for p in predictions]
+    # Score the columns directly; no round trip through per-row dictionaries
+    X, _ = prepare_features(df)
+    results_df = df[MODEL_FEATURES].copy()
+    for column, values in score_features(model, X).items():
+        results_df[column] = values
     
     # Save if output path provided
     if output_path:
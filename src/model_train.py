@@ -134,7 +134,16 @@ def evaluate_model(model, X, y_true):
 def save_model(model):
     """Saves the trained model using joblib."""
     os.makedirs(os.path.dirname(MODEL_FILE), exist_ok=True)
-    joblib.dump(model, MODEL_FILE)
+    # Uncompressed so loaders can memory-map the arrays (joblib.load(..., mmap_mode='r')).
+    # Written to a temp file and swapped in: rewriting the mapped file in place would
+    # invalidate (SIGBUS) any process still serving the previous model.
+    tmp_file = f"{MODEL_FILE}.{os.getpid()}.tmp"
+    try:
+        joblib.dump(model, tmp_file, compress=0)
+        os.replace(tmp_file, MODEL_FILE)
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
     print(f"✅ Trained Isolation Forest model saved to: {MODEL_FILE}")
 
 def save_metrics(metrics):
@@ -151,6 +160,34 @@ def save_metrics(metrics):
     except Exception as e:
         print(f"⚠️ Warning: Could not save metrics file: {e}")
 
+def save_shap_values(model, X, event_ids, anomaly_scores):
+    """
+    Precomputes SHAP values for every event the model flags as anomalous and
+    saves them next to the model, so the API can serve those explanations
+    without running the explainer per request.
+    """
+    shap_file = Path(MODEL_FILE).parent / "shap_values.npz"
+    
+    try:
+        # Imported here: xai_explainer itself imports MODEL_FEATURES from this module
+        from src.xai_explainer import create_explainer, compute_shap_values
+        
+        # decision_function < 0 is exactly what model.predict() labels as an outlier
+        flagged = anomaly_scores < 0
+        print(f"-> Precomputing SHAP values for {int(flagged.sum())} flagged events...")
+        shap_values, base_value = compute_shap_values(X[flagged], create_explainer(model))
+        
+        np.savez(
+            shap_file,
+            event_id=np.asarray(event_ids)[flagged].astype(str),
+            shap_values=shap_values,
+            base_value=np.float64(base_value),
+            features=np.array(MODEL_FEATURES)
+        )
+        print(f"✅ SHAP values saved to: {shap_file}")
+    except Exception as e:
+        print(f"⚠️ Warning: Could not precompute SHAP values: {e}")
+
 def model_training_pipeline():
     """Main function to execute the model training process."""
     
@@ -170,6 +207,10 @@ def model_training_pipeline():
     # Save metrics to JSON file
     save_metrics(metrics)
     
+    # Precompute explanations for the flagged events (written after the model,
+    # so the API can tell they belong to it)
+    save_shap_values(model, X, df_full['event_id'], anomaly_scores)
+    
     # Save anomaly scores back to processed data
     df_full['anomaly_score'] = -anomaly_scores
     df_full.to_csv(PROCESSED_DATA_FILE, index=False)
@@ -42,9 +42,9 @@ class RiskTrajectory:
         self.decay_half_life = decay_half_life
         self.baseline_score = baseline_score
         
-        # Sort events by timestamp
+        # Sort events by timestamp (sort_values already returns a new frame)
         if 'timestamp' in historical_events.columns:
-            self.events = historical_events.sort_values('timestamp').copy()
+            self.events = historical_events.sort_values('timestamp')
         else:
             self.events = historical_events.copy()
         
@@ -110,8 +110,8 @@ class RiskTrajectory:
         now = datetime.now()
         self.events['days_ago'] = (now - self.events['timestamp']).dt.total_seconds() / 86400
         
-        # Calculate decay factor for each event
-        self.events['decay_factor'] = self.events['days_ago'].apply(self.calculate_decay_factor)
+        # Calculate decay factor for each event (vectorized calculate_decay_factor)
+        self.events['decay_factor'] = 0.5 ** (self.events['days_ago'].clip(lower=0) / self.decay_half_life)
         
         # Calculate decay-weighted risk
         if 'anomaly_score' in self.events.columns:
@@ -137,7 +137,7 @@ class RiskTrajectory:
         
         if len(self.events) > 0:
             # Sort explicitly by timestamp for accumulation
-            sorted_evts = self.events.sort_values('timestamp').copy()
+            sorted_evts = self.events.sort_values('timestamp')
             
             # Vectorized calculation of time differences (in days)
             ts = sorted_evts['timestamp']
@@ -166,55 +166,92 @@ class RiskTrajectory:
             
             self.events.loc[sorted_evts.index, 'accumulated_risk'] = acc_risks
 
-        # Group by date for timeline
-        self.events['date'] = self.events['timestamp'].dt.date
-        
-        timeline = []
-        for date, group in self.events.groupby('date'):
-            # Calculate metrics for this date
-            event_count = len(group)
-            avg_risk = float(group['anomaly_score'].mean()) if 'anomaly_score' in group.columns else 0.0
-            
-            # Count risk levels
-            if 'risk_level' in group.columns:
-                high_risk = int((group['risk_level'] == 'High').sum())
-                medium_risk = int((group['risk_level'] == 'Medium').sum())
-                low_risk = int((group['risk_level'] == 'Low').sum())
-            else:
-                high_risk = medium_risk = low_risk = 0
-            
-            # The "Cumulative Load" for the day is the peak accumulated risk on that day
-            day_acc_risk = float(group['accumulated_risk'].max())
-                
-            # Average decay factor for this date
-            avg_decay = float(group['decay_factor'].mean())
-            if np.isnan(avg_decay):
-                avg_decay = 1.0
-            
-            timeline.append({
-                'date': str(date),
-                'events': int(event_count),
-                'avg_risk': float(round(avg_risk, 4)),
-                'cumulative_risk': float(round(day_acc_risk, 4)), # Rebranding this for the chart
-                'avg_decay_factor': float(round(avg_decay, 4)),
-                'high_risk_events': int(high_risk),
-                'medium_risk_events': int(medium_risk),
-                'low_risk_events': int(low_risk)
-            })
-        
-        # Sort by date
-        timeline.sort(key=lambda x: x['date'])
-        
-        # Standardize 'running_cumulative_risk' to the same leaky bucket values
-        for entry in timeline:
-            entry['running_cumulative_risk'] = entry['cumulative_risk']
-        
-        self.trajectory_data = timeline
+        # Aggregate per calendar day for the timeline
+        self.trajectory_data = self._aggregate_daily()
         
         # Detect escalation
         self._detect_escalation()
         self._determine_trend()
     
+    def _aggregate_daily(self) -> List[Dict]:
+        """
+        Build the per-day timeline from the event columns.
+        
+        Events are ordered by day once, day boundaries are found with np.unique,
+        and every metric is a single ufunc reduceat over those boundaries.
+        """
+        days = self.events['timestamp'].dt.normalize().to_numpy()
+        valid = ~np.isnat(days)
+        if not valid.any():
+            return []
+        
+        order = np.argsort(days, kind='stable')
+        order = order[valid[order]]
+        days = days[order]
+        unique_days, first_idx = np.unique(days, return_index=True)
+        counts = np.diff(np.append(first_idx, len(days)))
+        
+        def column(name):
+            return self.events[name].to_numpy(dtype=float)[order]
+        
+        def daily_mean(values):
+            # NaN-aware mean, matching pandas' groupby mean
+            present = ~np.isnan(values)
+            totals = np.add.reduceat(np.where(present, values, 0.0), first_idx)
+            n = np.add.reduceat(present.astype(np.int64), first_idx)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return totals / n
+        
+        if 'anomaly_score' in self.events.columns:
+            avg_risk = daily_mean(column('anomaly_score'))
+        else:
+            avg_risk = np.zeros(len(unique_days))
+        
+        # The "Cumulative Load" for the day is the peak accumulated risk on that day
+        day_acc_risk = np.fmax.reduceat(column('accumulated_risk'), first_idx)
+        
+        # Average decay factor for each date
+        avg_decay = daily_mean(column('decay_factor'))
+        avg_decay = np.where(np.isnan(avg_decay), 1.0, avg_decay)
+        
+        # Count risk levels
+        if 'risk_level' in self.events.columns:
+            levels = self.events['risk_level'].to_numpy()[order]
+            high_risk, medium_risk, low_risk = (
+                np.add.reduceat((levels == level).astype(np.int64), first_idx)
+                for level in ('High', 'Medium', 'Low')
+            )
+        else:
+            high_risk = medium_risk = low_risk = np.zeros(len(unique_days), dtype=np.int64)
+        
+        avg_risk = np.round(avg_risk, 4).tolist()
+        day_acc_risk = np.round(day_acc_risk, 4).tolist()
+        
+        # 'running_cumulative_risk' mirrors the same leaky bucket values
+        return [
+            {
+                'date': date,
+                'events': events,
+                'avg_risk': avg,
+                'cumulative_risk': acc, # Rebranding this for the chart
+                'avg_decay_factor': decay,
+                'high_risk_events': high,
+                'medium_risk_events': medium,
+                'low_risk_events': low,
+                'running_cumulative_risk': acc
+            }
+            for date, events, avg, acc, decay, high, medium, low in zip(
+                np.datetime_as_string(unique_days, unit='D').tolist(),
+                counts.tolist(),
+                avg_risk,
+                day_acc_risk,
+                np.round(avg_decay, 4).tolist(),
+                high_risk.tolist(),
+                medium_risk.tolist(),
+                low_risk.tolist()
+            )
+        ]
+    
     def _detect_escalation(self):
         """
         Detect if user's risk is escalating.
@@ -232,19 +269,14 @@ class RiskTrajectory:
             }
             return
         
-        now = datetime.now()
+        # Reuse the event ages computed for the decay pass
+        days_ago = self.events['days_ago'].to_numpy()
         
         # Recent events (last 7 days)
-        recent_cutoff = now - timedelta(days=7)
-        recent_events = self.events[self.events['timestamp'] >= recent_cutoff]
+        recent_events = self.events[days_ago <= 7]
         
         # Previous events (days 8-14)
-        previous_start = now - timedelta(days=14)
-        previous_end = recent_cutoff
-        previous_events = self.events[
-            (self.events['timestamp'] >= previous_start) & 
-            (self.events['timestamp'] < previous_end)
-        ]
+        previous_events = self.events[(days_ago > 7) & (days_ago <= 14)]
         
         if len(recent_events) == 0:
             self.is_escalating = False
@@ -405,6 +437,10 @@ class TrajectoryManager:
         self.decay_half_life = decay_half_life
         self.profile_manager = profile_manager
         self.trajectories = {}
+        # Sorted summary lists per trend and the overall statistics; trajectories
+        # are fixed once built, so these stay valid until the manager is rebuilt
+        # on the next reload
+        self._trend_cache = {}
         
         # Calculate trajectories for all users
         self._calculate_all_trajectories()
@@ -415,12 +451,12 @@ class TrajectoryManager:
             print("Warning: No user_id column in data. Cannot create trajectories.")
             return
         
-        unique_users = self.data_df['user_id'].unique()
+        # One groupby pass partitions the events; a mask scan per user is O(users * events)
+        user_groups = self.data_df.groupby('user_id', sort=False, observed=True)
         
-        print(f"Calculating risk trajectories for {len(unique_users)} users...")
-        for user_id in unique_users:
-            user_events = self.data_df[self.data_df['user_id'] == user_id].copy()
-            
+        print(f"Calculating risk trajectories for {user_groups.ngroups} users...")
+        for user_id, user_events in user_groups:
+            # RiskTrajectory takes its own sorted copy of the events
             # Get baseline score from profile manager if available
             baseline_score = 0.0
             if self.profile_manager:
@@ -451,6 +487,10 @@ class TrajectoryManager:
         Returns:
             List of user summaries with matching trend
         """
+        cached = self._trend_cache.get(trend)
+        if cached is not None:
+            return list(cached)
+        
         matching_users = []
         
         for user_id, trajectory in self.trajectories.items():
@@ -461,10 +501,15 @@ class TrajectoryManager:
         # Sort by cumulative risk (most negative first)
         matching_users.sort(key=lambda x: x['cumulative_risk'])
         
-        return matching_users
+        self._trend_cache[trend] = matching_users
+        return list(matching_users)
     
     def get_escalating_users(self) -> List[Dict]:
         """Get all users with escalating risk (convenience method)."""
+        cached = self._trend_cache.get('_escalating')
+        if cached is not None:
+            return list(cached)
+        
         escalating = []
         
         for user_id, trajectory in self.trajectories.items():
@@ -481,10 +526,20 @@ class TrajectoryManager:
             )
         )
         
-        return escalating
+        self._trend_cache['_escalating'] = escalating
+        return list(escalating)
     
     def get_statistics(self) -> Dict:
         """Get overall statistics across all users."""
+        cached = self._trend_cache.get('_statistics')
+        if cached is not None:
+            return dict(cached)
+        
+        self._trend_cache['_statistics'] = self._compute_statistics()
+        return dict(self._trend_cache['_statistics'])
+    
+    def _compute_statistics(self) -> Dict:
+        """Aggregate trend counts and average cumulative risk over all trajectories."""
         if len(self.trajectories) == 0:
             return {
                 'total_users': 0,
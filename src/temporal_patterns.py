@@ -221,9 +221,8 @@ class TemporalManager:
         if 'user_id' not in self.data_df.columns:
             return
             
-        unique_users = self.data_df['user_id'].unique()
-        for user_id in unique_users:
-            user_slice = self.data_df[self.data_df['user_id'] == user_id]
+        # One groupby pass instead of a full-column mask per user
+        for user_id, user_slice in self.data_df.groupby('user_id', sort=False, observed=True):
             self.detectors[user_id] = TemporalPatternDetector(user_id, user_slice)
 
     def get_user_patterns(self, user_id: str) -> List[Dict]:
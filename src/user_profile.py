@@ -390,11 +390,13 @@ class UserProfileManager:
             print("Warning: No user_id column in data. Cannot create profiles.")
             return
         
-        unique_users = self.data_df['user_id'].unique()
+        # One groupby pass partitions the events; a mask scan per user is O(users * events)
+        user_groups = self.data_df.groupby('user_id', sort=False, observed=True)
         
-        print(f"Loading profiles for {len(unique_users)} users...")
-        for user_id in unique_users:
-            self.profiles[user_id] = self.get_or_create_profile(user_id)
+        print(f"Loading profiles for {user_groups.ngroups} users...")
+        for user_id, user_events in user_groups:
+            if user_id not in self.profiles:
+                self.profiles[user_id] = UserProfile(user_id, user_events.copy())
         
         print(f"✅ Loaded {len(self.profiles)} user profiles")
     
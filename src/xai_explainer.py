@@ -110,7 +110,101 @@ def load_data_and_model():
         return None, None
 
 
-def generate_shap_explanations(df, model, event_id=None):
+def create_explainer(model):
+    """
+    Builds a SHAP TreeExplainer for the trained model.
+
+    Construction walks the whole tree ensemble, so long-lived callers (the API)
+    should build it once per loaded model and pass it to generate_shap_explanations.
+    """
+    logger.info("Initializing SHAP TreeExplainer...")
+    return shap.TreeExplainer(model)
+
+
+def compute_shap_values(X_explain, explainer):
+    """
+    Runs the explainer over the MODEL_FEATURES rows of X_explain.
+    
+    Returns:
+        Tuple of (shap_values array with one row per event, base_value float)
+    """
+    # Calculate SHAP values
+    logger.info("Calculating SHAP values...")
+    shap_values = explainer.shap_values(X_explain[MODEL_FEATURES])
+    
+    # Handle list output (some versions of SHAP return lists)
+    if isinstance(shap_values, list):
+        shap_values = shap_values[0]
+    
+    base_value = explainer.expected_value
+    
+    # Handle base_value if it's an array
+    if isinstance(base_value, np.ndarray):
+        base_value = float(base_value[0])
+    else:
+        base_value = float(base_value)
+    
+    return np.asarray(shap_values), base_value
+
+
+def format_explanation(event_id, shap_row, feature_row, base_value, features=MODEL_FEATURES):
+    """
+    Builds the API explanation for one event from its SHAP values.
+    
+    Args:
+        event_id: Event being explained
+        shap_row: SHAP value per feature
+        feature_row: Feature value per feature
+        base_value: Explainer expected value
+        features: Feature names aligned with shap_row and feature_row
+    """
+    # Format Explanation for API/Frontend
+    explanation_data = []
+    
+    # Create a structured list of contributions
+    for i, feature in enumerate(features):
+        # In Isolation Forest, negative SHAP values indicate increased anomaly risk
+        is_increasing_risk = shap_row[i] < 0
+        
+        explanation_data.append({
+            'feature': feature,
+            'value_at_risk': float(feature_row[i]),
+            'shap_contribution': float(shap_row[i]), 
+            'is_high_risk_contributor': bool(is_increasing_risk)
+        })
+    
+    # Sort contributions by magnitude (absolute value)
+    explanation_data.sort(key=lambda x: abs(x['shap_contribution']), reverse=True)
+    
+    return {
+        'event_id': str(event_id),
+        'base_value': float(base_value),
+        'explanation': explanation_data
+    }
+
+
+def explain_events(X_explain, event_ids, explainer):
+    """
+    Computes SHAP explanations for several events with a single explainer call.
+    
+    Args:
+        X_explain: DataFrame of MODEL_FEATURES, one row per event
+        event_ids: Event IDs aligned with the rows of X_explain
+        explainer: TreeExplainer (see create_explainer)
+        
+    Returns:
+        List of explanation dictionaries, in the order of event_ids
+    """
+    shap_values, base_value = compute_shap_values(X_explain, explainer)
+    feature_values = X_explain[MODEL_FEATURES].to_numpy(dtype=float)
+    
+    return [
+        format_explanation(event_id, shap_values[row], feature_values[row], base_value)
+        for row, event_id in enumerate(event_ids)
+    ]
+
+
+def generate_shap_explanations(df, model, event_id=None, explainer=None):
     """
     Generates SHAP values for a specific event or the entire high-risk dataset.
     
@@ -118,6 +212,7 @@ def generate_shap_explanations(df, model, event_id=None):
         df: DataFrame with processed features
         model: Trained IsolationForest model
         event_id: Optional specific event ID to explain
+        explainer: Optional prebuilt TreeExplainer (see create_explainer)
         
     Returns:
         Dictionary with event_id, base_value, and explanation details
@@ -141,8 +236,8 @@ def generate_shap_explanations(df, model, event_id=None):
             X = X.fillna(X.median())
 
         # Initialize the SHAP Explainer
-        logger.info("Initializing SHAP TreeExplainer...")
-        explainer = shap.TreeExplainer(model)
+        if explainer is None:
+            explainer = create_explainer(model)
         
         # Find the event to explain
         if event_id is not None:
@@ -166,44 +261,7 @@ def generate_shap_explanations(df, model, event_id=None):
 
             logger.info(f"No event_id specified. Explaining highest risk event: {event_id}")
 
-        # Calculate SHAP values
-        logger.info("Calculating SHAP values...")
-        shap_values = explainer.shap_values(X_explain)
-        
-        # Handle list output (some versions of SHAP return lists)
-        if isinstance(shap_values, list):
-            shap_values = shap_values[0]
-
-        # Format Explanation for API/Frontend
-        explanation_data = []
-        base_value = explainer.expected_value
-        
-        # Handle base_value if it's an array
-        if isinstance(base_value, np.ndarray):
-            base_value = float(base_value[0])
-        else:
-            base_value = float(base_value)
-        
-        # Create a structured list of contributions
-        for i, feature in enumerate(MODEL_FEATURES):
-            # In Isolation Forest, negative SHAP values indicate increased anomaly risk
-            is_increasing_risk = shap_values[0][i] < 0
-            
-            explanation_data.append({
-                'feature': feature,
-                'value_at_risk': float(X_explain.iloc[0][feature]),
-                'shap_contribution': float(shap_values[0][i]), 
-                'is_high_risk_contributor': bool(is_increasing_risk)
-            })
-        
-        # Sort contributions by magnitude (absolute value)
-        explanation_data.sort(key=lambda x: abs(x['shap_contribution']), reverse=True)
-        
-        result = {
-            'event_id': str(event_id),
-            'base_value': base_value,
-            'explanation': explanation_data
-        }
+        result = explain_events(X_explain.iloc[:1], [event_id], explainer)[0]
         
         logger.info("✅ SHAP explanation generated successfully")
         return result
@@ -0,0 +1,313 @@
+"""
+API Tests for the Served Data
+
+Runs the endpoints against a small processed dataset and model written to a
+temporary directory:
+- /explain error handling
+- Explanation micro-batching and prebuilt /risks pages
+- ETag/304 cache validators
+- Processed CSV parsing
+- Per-user recent-event order
+- Streamed /risks bodies
+- Parquet cache freshness (needs pyarrow)
+
+Author: VORTEX Team
+"""
+
+import pytest
+import asyncio
+import pandas as pd
+import numpy as np
+import joblib
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+from sklearn.ensemble import IsolationForest
+
+from src.api import main
+from src.model_train import MODEL_FEATURES
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """DataStore loaded from a small processed CSV and model in tmp_path."""
+    rng = np.random.default_rng(0)
+    n_events = 120
+    
+    df = pd.DataFrame({
+        'event_id': [f"user_{i % 3:03d}_{i}" for i in range(n_events)],
+        'user_id': [f"user_{i % 3:03d}" for i in range(n_events)],
+        'timestamp': pd.date_range('2025-01-01', periods=n_events, freq='37min'),
+        'anomaly_flag_truth': (rng.random(n_events) < 0.05).astype(int),
+    })
+    for feature in MODEL_FEATURES:
+        df[feature] = rng.normal(size=n_events)
+    for flag in ['sensitive_file_access', 'external_ip_connection', 'is_weekend', 'is_off_hours']:
+        df[flag] = rng.integers(0, 2, size=n_events)
+    
+    model = IsolationForest(n_estimators=20, random_state=0).fit(df[MODEL_FEATURES])
+    df['anomaly_score'] = -model.decision_function(df[MODEL_FEATURES])
+    
+    processed_file = tmp_path / "processed_features.csv"
+    model_file = tmp_path / "isolation_forest_model.pkl"
+    df.to_csv(processed_file, index=False)
+    joblib.dump(model, model_file)
+    
+    monkeypatch.setattr(main, 'PROCESSED_DATA_FILE', str(processed_file))
+    monkeypatch.setattr(main, 'MODEL_FILE', str(model_file))
+    monkeypatch.setattr(main, 'data_store', main.DataStore())
+    main.data_store.load()
+    return main.data_store
+
+
+@pytest.fixture
+def client(store):
+    """Client for the loaded store; not used as a context manager, so startup does not reload."""
+    return TestClient(main.app)
+
+
+class TestExplain:
+    """Test suite for /explain."""
+    
+    def test_explain_known_event(self, client, store):
+        """Test that a known event is explained."""
+        event_id = store.snapshot.df['event_id'].iloc[0]
+        response = client.get(f"/explain/{event_id}")
+        
+        assert response.status_code == 200
+        assert response.json()['event_id'] == event_id
+        assert len(response.json()['explanation']) == len(MODEL_FEATURES)
+    
+    def test_unknown_event_is_404(self, client):
+        """Test that an unknown event returns 404."""
+        response = client.get("/explain/does-not-exist")
+        
+        assert response.status_code == 404
+    
+    def test_explainer_failure_is_500(self, client, store, monkeypatch):
+        """Test that an explainer error for a known event is a 500, not a 404."""
+        def failing_batch(event_ids):
+            raise RuntimeError("explainer exploded")
+        monkeypatch.setattr(main, 'explain_event_batch', failing_batch)
+        
+        event_id = store.snapshot.df['event_id'].iloc[0]
+        response = client.get(f"/explain/{event_id}")
+        
+        assert response.status_code == 500
+        assert "explainer exploded" in response.json()['detail']
+
+
+
+class TestExplainBatching:
+    """Test suite for ExplainBatcher micro-batching."""
+    
+    def test_batched_results_match_single_events(self, store, monkeypatch):
+        """Test that concurrent requests are explained in one batch with the same results as one at a time."""
+        event_ids = store.snapshot.df['event_id'].iloc[:6].tolist() + ['does-not-exist']
+        singles = [main.explain_event_batch([event_id])[0] for event_id in event_ids]
+        
+        batch_sizes = []
+        explain_event_batch = main.explain_event_batch
+        def recording_batch(ids):
+            batch_sizes.append(len(ids))
+            return explain_event_batch(ids)
+        monkeypatch.setattr(main, 'explain_event_batch', recording_batch)
+        
+        async def run():
+            batcher = main.ExplainBatcher(max_batch=32)
+            return await asyncio.gather(*(batcher.explain(event_id) for event_id in event_ids))
+        batched = asyncio.run(run())
+        
+        assert batch_sizes == [len(event_ids)]
+        assert batched[-1] is None and singles[-1] is None
+        for single, result in zip(singles[:-1], batched[:-1]):
+            assert result['event_id'] == single['event_id']
+            assert result['base_value'] == pytest.approx(single['base_value'])
+            assert [f['feature'] for f in result['explanation']] == [f['feature'] for f in single['explanation']]
+            assert [f['shap_contribution'] for f in result['explanation']] == pytest.approx(
+                [f['shap_contribution'] for f in single['explanation']]
+            )
+    
+    def test_max_batch_splits_requests(self, store, monkeypatch):
+        """Test that no batch exceeds max_batch."""
+        event_ids = store.snapshot.df['event_id'].iloc[:5].tolist()
+        
+        batch_sizes = []
+        def recording_batch(ids):
+            batch_sizes.append(len(ids))
+            return [None] * len(ids)
+        monkeypatch.setattr(main, 'explain_event_batch', recording_batch)
+        
+        async def run():
+            batcher = main.ExplainBatcher(max_batch=2)
+            return await asyncio.gather(*(batcher.explain(event_id) for event_id in event_ids))
+        asyncio.run(run())
+        
+        assert max(batch_sizes) <= 2
+        assert sum(batch_sizes) == len(event_ids)
+
+
+class TestPrebuiltRiskPages:
+    """Test suite for the /risks pages rendered at load time."""
+    
+    def test_prebuilt_pages_match_computed_pages(self, client, store):
+        """Test that every HOT_RISK_PAGES body equals the page computed on request."""
+        snapshot = store.snapshot
+        assert set(snapshot.prebuilt_pages) == set(main.HOT_RISK_PAGES)
+        
+        for risk_level, limit, offset in main.HOT_RISK_PAGES:
+            params = {'limit': limit, 'offset': offset}
+            if risk_level:
+                params['risk_level'] = risk_level
+            
+            prebuilt = client.get("/risks", params=params)
+            pages = snapshot.prebuilt_pages
+            snapshot.prebuilt_pages = {}
+            try:
+                computed = client.get("/risks", params=params)
+            finally:
+                snapshot.prebuilt_pages = pages
+            
+            assert prebuilt.status_code == computed.status_code == 200
+            assert prebuilt.json() == computed.json()
+
+
+class TestCacheValidators:
+    """Test suite for ETag/Cache-Control on /explain and /metrics."""
+    
+    @pytest.fixture
+    def paths(self, store):
+        return [f"/explain/{store.snapshot.df['event_id'].iloc[0]}", "/metrics"]
+    
+    def test_etag_and_cache_control(self, client, paths):
+        """Test that responses carry an ETag and a Cache-Control header."""
+        for path in paths:
+            response = client.get(path)
+            
+            assert response.status_code == 200
+            assert response.headers['etag']
+            assert response.headers['cache-control'] == "public, max-age=60"
+    
+    def test_matching_if_none_match_is_304(self, client, paths):
+        """Test that a matching If-None-Match returns 304 with no body."""
+        for path in paths:
+            etag = client.get(path).headers['etag']
+            response = client.get(path, headers={'If-None-Match': etag})
+            
+            assert response.status_code == 304
+            assert response.content == b''
+            assert response.headers['etag'] == etag
+    
+    def test_stale_if_none_match_is_200(self, client, paths):
+        """Test that a non-matching If-None-Match gets the full response."""
+        for path in paths:
+            response = client.get(path, headers={'If-None-Match': '"stale"'})
+            
+            assert response.status_code == 200
+    
+    def test_etag_changes_after_reload_of_new_files(self, client, store, paths):
+        """Test that reloading rewritten files changes the ETag, and reloading unchanged files does not."""
+        before = [client.get(path).headers['etag'] for path in paths]
+        
+        store.load()
+        assert [client.get(path).headers['etag'] for path in paths] == before
+        
+        csv_path = main.PROCESSED_DATA_FILE
+        pd.read_csv(csv_path).to_csv(csv_path, index=False)
+        os.utime(csv_path, ns=(0, 10**18))
+        store.load()
+        after = [client.get(path).headers['etag'] for path in paths]
+        
+        assert all(new != old for new, old in zip(after, before))
+        assert client.get(paths[1], headers={'If-None-Match': before[1]}).status_code == 200
+
+
+class TestProcessedData:
+    """Test suite for reading the processed CSV."""
+    
+    def test_missing_flag_values_still_load(self, store):
+        """Test that empty cells in int8 flag columns fall back to float instead of failing the load."""
+        csv_path = main.PROCESSED_DATA_FILE
+        df = pd.read_csv(csv_path)
+        df.loc[[3, 7], 'is_weekend'] = np.nan
+        df.to_csv(csv_path, index=False)
+        main.processed_parquet_path().unlink(missing_ok=True)
+        
+        loaded = main.read_processed_frame()
+        
+        assert loaded['is_weekend'].isna().sum() == 2
+        assert loaded['is_off_hours'].dtype == 'int8'
+        assert loaded['user_id'].dtype == 'category'
+
+
+class TestUserRecentRows:
+    """Test suite for the per-user recent-event index."""
+    
+    def test_most_recent_first_and_missing_timestamps_last(self):
+        """Test that events sort newest first with NaT after every real timestamp."""
+        df = pd.DataFrame({
+            'user_id': pd.Categorical(['a', 'a', 'a', 'b', 'a']),
+            'timestamp': pd.to_datetime(['2025-01-02', None, '2025-01-03', '2025-01-01', '2025-01-01']),
+        })
+        
+        rows = main.compute_user_recent_rows(df)
+        
+        assert rows['a'].tolist() == [2, 0, 4, 1]
+        assert rows['b'].tolist() == [3]
+
+
+class TestRiskStreaming:
+    """Test suite for streamed /risks responses."""
+    
+    def test_stream_with_missing_scores_without_orjson(self, client, store, monkeypatch):
+        """Test that NaN scores stream as null with the stdlib encoder instead of truncating the body."""
+        csv_path = main.PROCESSED_DATA_FILE
+        df = pd.read_csv(csv_path)
+        df.loc[:4, 'anomaly_score'] = np.nan
+        df.to_csv(csv_path, index=False)
+        main.processed_parquet_path().unlink(missing_ok=True)
+        store.load()
+        
+        monkeypatch.setattr(main, 'orjson', None)
+        monkeypatch.setattr(main, 'RISK_STREAM_CHUNK', 10)
+        response = client.get("/risks", params={'risk_level': 'Low'})
+        
+        assert response.status_code == 200
+        events = response.json()
+        assert len(events) == len(store.snapshot.risk_orders['Low'])
+        assert sum(event['anomaly_score'] is None for event in events) == 5
+
+
+class TestParquetCache:
+    """Test suite for the processed-data Parquet cache."""
+    
+    @pytest.fixture(autouse=True)
+    def require_pyarrow(self):
+        pytest.importorskip('pyarrow')
+    
+    def test_cache_is_used_for_unchanged_csv(self, store, monkeypatch):
+        """Test that an unchanged CSV is served from the cache without parsing it."""
+        assert main.processed_parquet_path().exists()
+        
+        def no_csv(*args, **kwargs):
+            raise AssertionError("CSV should not be parsed")
+        monkeypatch.setattr(main.pd, 'read_csv', no_csv)
+        
+        assert len(main.read_processed_frame()) == len(store.snapshot.df)
+    
+    def test_cache_is_ignored_for_replaced_csv(self, store):
+        """Test that a CSV restored with an older mtime is not answered from the stale cache."""
+        csv_path = main.PROCESSED_DATA_FILE
+        df = pd.read_csv(csv_path)
+        df.iloc[:10].to_csv(csv_path, index=False)
+        os.utime(csv_path, ns=(0, 0))
+        
+        assert len(main.read_processed_frame()) == 10
+
+if __name__ == '__main__':
+    # Run tests with pytest
+    pytest.main([__file__, '-v', '--tb=short'])
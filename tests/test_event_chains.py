@@ -0,0 +1,90 @@
+"""
+Unit Tests for Event Chain Detection
+
+Tests EventChainDetector on a small fixed event log:
+- Pattern matching within the time window
+- Time window limits
+- Input order independence
+
+Author: VORTEX Team
+"""
+
+import pytest
+import pandas as pd
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.event_chains import EventChainDetector
+
+
+def make_events(rows):
+    """Build a user's event log from (event_id, timestamp, file_access_count, upload_size_mb, anomaly_score) rows."""
+    df = pd.DataFrame(rows, columns=['event_id', 'timestamp', 'file_access_count', 'upload_size_mb', 'anomaly_score'])
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    df['user_id'] = 'user_001'
+    df['hour_of_day'] = df['timestamp'].dt.hour
+    df['sensitive_file_access'] = 0
+    df['external_ip_connection'] = 0
+    return df
+
+
+class TestEventChainDetector:
+    """Test suite for EventChainDetector."""
+    
+    @pytest.fixture
+    def exfiltration_rows(self):
+        """Off-hours access, then mass file access, then a large upload, between ordinary events."""
+        return [
+            ('e0', '2025-01-06 10:00', 5, 5.0, 0.01),
+            ('e1', '2025-01-07 05:00', 5, 5.0, 0.10),   # off hours
+            ('e2', '2025-01-07 07:00', 30, 5.0, 0.20),  # mass file access
+            ('e3', '2025-01-07 09:00', 5, 60.0, 0.30),  # large upload
+            ('e4', '2025-01-07 15:00', 5, 5.0, 0.02),
+        ]
+    
+    def test_classify_events(self, exfiltration_rows):
+        """Test the tags assigned to each event."""
+        detector = EventChainDetector('user_001', make_events(exfiltration_rows))
+        tags = detector._classify_events()
+        
+        assert tags[0] == ()
+        assert tags[1] == ('off_hours_access', 'off_hours')
+        assert tags[2] == ('mass_file_access',)
+        assert tags[3] == ('large_upload', 'repeated_uploads')
+    
+    def test_detects_exfiltration_chain(self, exfiltration_rows):
+        """Test that the three-step sequence is detected as a single chain."""
+        detector = EventChainDetector('user_001', make_events(exfiltration_rows))
+        
+        assert len(detector.detected_chains) == 1
+        chain = detector.detected_chains[0]
+        assert chain['pattern_type'] == 'data_exfiltration'
+        assert [event['event_id'] for event in chain['events']] == ['e1', 'e2', 'e3']
+        assert chain['matched_sequence'] == ['off_hours_access', 'mass_file_access', 'large_upload']
+        assert chain['duration_hours'] == 4.0
+        assert chain['chain_risk'] == pytest.approx(round((0.10 + 0.20 + 0.30) * 2.0, 4))
+        assert chain['start_time_iso'] == '2025-01-07T05:00:00'
+    
+    def test_events_outside_window_do_not_chain(self, exfiltration_rows):
+        """Test that a step beyond the pattern's time window breaks the chain."""
+        rows = list(exfiltration_rows)
+        rows[3] = ('e3', '2025-01-07 13:30', 5, 60.0, 0.30)  # 8.5h after the start; window is 8h
+        detector = EventChainDetector('user_001', make_events(rows))
+        
+        assert detector.detected_chains == []
+    
+    def test_input_order_does_not_matter(self, exfiltration_rows):
+        """Test that shuffled input rows give the same chains."""
+        ordered = EventChainDetector('user_001', make_events(exfiltration_rows))
+        shuffled = EventChainDetector('user_001', make_events(exfiltration_rows[::-1]))
+        
+        assert [[e['event_id'] for e in c['events']] for c in shuffled.detected_chains] == \
+            [[e['event_id'] for e in c['events']] for c in ordered.detected_chains]
+
+
+if __name__ == '__main__':
+    # Run tests with pytest
+    pytest.main([__file__, '-v', '--tb=short'])
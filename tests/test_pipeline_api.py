@@ -0,0 +1,124 @@
+"""
+API Tests for Background Pipeline Tasks
+
+Tests /pipeline/generate-data and /pipeline/tasks/{task_id}:
+- 202 Accepted with a task_id
+- Status transitions to completed or failed
+- Unknown task IDs
+- DataStore.reload coalescing (used by /reload and the pipeline)
+
+Author: VORTEX Team
+"""
+
+import pytest
+import asyncio
+import threading
+import time
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+
+from src.api import main
+
+
+class TestPipelineTasks:
+    """Test suite for background pipeline task endpoints."""
+    
+    @pytest.fixture
+    def client(self, monkeypatch):
+        """Client with an empty task history; not used as a context manager, so startup does not load data."""
+        monkeypatch.setattr(main, 'pipeline_tasks', main.OrderedDict())
+        return TestClient(main.app)
+    
+    def test_generate_data_accepted(self, client, monkeypatch):
+        """Test that generation is accepted with a task_id and completes."""
+        async def fake_step(step):
+            return "/data/raw_behavior_logs.csv"
+        monkeypatch.setattr(main, 'run_pipeline_step', fake_step)
+        
+        response = client.post("/pipeline/generate-data")
+        
+        assert response.status_code == 202
+        body = response.json()
+        assert body['task'] == "generate_data"
+        assert body['status'] == "accepted"
+        assert body['task_id']
+        
+        # TestClient runs background tasks before returning the response
+        status_response = client.get(f"/pipeline/tasks/{body['task_id']}")
+        assert status_response.status_code == 200
+        assert status_response.json()['status'] == "completed"
+        assert "raw_behavior_logs.csv" in status_response.json()['message']
+    
+    def test_generate_data_failed(self, client, monkeypatch):
+        """Test that an error in the pipeline step is reported as failed."""
+        async def failing_step(step):
+            raise RuntimeError("disk full")
+        monkeypatch.setattr(main, 'run_pipeline_step', failing_step)
+        
+        task_id = client.post("/pipeline/generate-data").json()['task_id']
+        
+        status_response = client.get(f"/pipeline/tasks/{task_id}")
+        assert status_response.status_code == 200
+        assert status_response.json()['status'] == "failed"
+        assert "disk full" in status_response.json()['message']
+    
+    def test_unknown_task_id(self, client):
+        """Test that an unknown task_id returns 404."""
+        response = client.get("/pipeline/tasks/does-not-exist")
+        
+        assert response.status_code == 404
+    
+    def test_task_history_is_bounded(self, client, monkeypatch):
+        """Test that only the most recent tasks are kept."""
+        monkeypatch.setattr(main, 'PIPELINE_TASK_HISTORY', 2)
+        for task_id in ['a', 'b', 'c']:
+            main.record_pipeline_task(task_id, "generate_data", "accepted", "queued")
+        
+        assert client.get("/pipeline/tasks/a").status_code == 404
+        assert client.get("/pipeline/tasks/c").status_code == 200
+
+
+
+class TestReload:
+    """Test suite for DataStore.reload coalescing."""
+    
+    @pytest.fixture
+    def store(self, monkeypatch):
+        """DataStore whose load() records its calls and takes a moment, like a real load."""
+        store = main.DataStore()
+        store.loads = []
+        store.started = threading.Event()
+        
+        def fake_load():
+            store.loads.append(store._reload_requests)
+            store.started.set()
+            time.sleep(0.1)
+        monkeypatch.setattr(store, 'load', fake_load)
+        return store
+    
+    def test_concurrent_requests_share_one_load(self, store):
+        """Test that reloads requested before a load starts are served by it."""
+        async def run():
+            await asyncio.gather(store.reload(), store.reload(), store.reload())
+        asyncio.run(run())
+        
+        assert len(store.loads) == 1
+    
+    def test_request_during_load_runs_another(self, store):
+        """Test that a reload requested after a load started reading gets a fresh load."""
+        async def run():
+            first = asyncio.ensure_future(store.reload())
+            await asyncio.to_thread(store.started.wait)
+            await asyncio.gather(first, store.reload(), store.reload())
+        asyncio.run(run())
+        
+        assert len(store.loads) == 2
+
+if __name__ == '__main__':
+    # Run tests with pytest
+    pytest.main([__file__, '-v', '--tb=short'])
@@ -88,33 +88,26 @@ except Exception as e:
 # Test 4: Escalating user trajectory
 print("\nTEST 4: Testing escalating user trajectory...")
 try:
-    np.random.seed(42)
-    events = []
+    rng = np.random.default_rng(42)
     base_date = datetime.now() - timedelta(days=30)
-    
-    for i in range(30):
-        # Days 0-20: Low risk
-        # Days 21-25: Medium risk
-        # Days 26-30: High risk
-        if i < 20:
-            risk = np.random.uniform(-0.2, -0.05)
-            level = 'Low'
-        elif i < 25:
-            risk = np.random.uniform(-0.5, -0.3)
-            level = 'Medium'
-        else:
-            risk = np.random.uniform(-0.9, -0.6)
-            level = 'High'
-        
-        events.append({
-            'event_id': f'EVT_{i:03d}',
-            'user_id': 'USR_ESCALATING',
-            'timestamp': base_date + timedelta(days=i),
-            'anomaly_score': risk,
-            'risk_level': level
-        })
-    
-    df = pd.DataFrame(events)
+
+    # Days 0-20: Low risk
+    # Days 21-25: Medium risk
+    # Days 26-30: High risk
+    risk = np.concatenate([
+        rng.uniform(-0.2, -0.05, 20),
+        rng.uniform(-0.5, -0.3, 5),
+        rng.uniform(-0.9, -0.6, 5)
+    ])
+    level = np.array(['Low'] * 20 + ['Medium'] * 5 + ['High'] * 5)
+
+    df = pd.DataFrame({
+        'event_id': [f'EVT_{i:03d}' for i in range(30)],
+        'user_id': 'USR_ESCALATING',
+        'timestamp': pd.date_range(base_date, periods=30, freq='D'),
+        'anomaly_score': risk,
+        'risk_level': level
+    })
     trajectory = RiskTrajectory('USR_ESCALATING', df)
     
     print(f"✅ Escalating user trajectory created!")